@@ -1,15 +1,62 @@
 from logging import ERROR as LOG_ERROR
 from os import getenv
 
-from flask import Flask
+from celery import Celery, Task
+from celery.exceptions import ImproperlyConfigured
+from flask import Flask, has_app_context
 from flask_cors import CORS
 from sentry_sdk import init as sentry_init
 from sentry_sdk.integrations.flask import FlaskIntegration
 from sentry_sdk.integrations.logging import LoggingIntegration
 
+from at.utils.file import StreamRequest
+from at.utils.json_provider import ORJSONProvider
+
+REDIS_SCHEMES = ('redis://', 'rediss://')
+
+
+def celery_init_app(app):
+    '''Returns Celery application for the given Flask application'''
+
+    class FlaskTask(Task):
+        '''Celery task that runs within the Flask application context'''
+
+        def __call__(self, *args, **kwargs):
+            if has_app_context():
+                return self.run(*args, **kwargs)
+            with app.app_context():
+                return self.run(*args, **kwargs)
+
+    celery = Celery(app.name, task_cls=FlaskTask)
+
+    if broker_url := app.config.get('CELERY_BROKER_URL'):
+        result_backend = app.config.get('CELERY_RESULT_BACKEND')
+        if not result_backend:
+            if not broker_url.startswith(REDIS_SCHEMES):
+                raise ImproperlyConfigured(
+                        'CELERY_RESULT_BACKEND is required when '
+                        'CELERY_BROKER_URL is not a Redis URL.')
+            # Redis broker doubles as the result backend
+            result_backend = broker_url
+        celery.conf.update(
+                broker_url=broker_url,
+                result_backend=result_backend)
+        app.logger.info('Celery is enabled.')
+    else:
+        # run tasks within the request when there is no broker
+        celery.conf.update(task_always_eager=True)
+        app.logger.info('Celery is disabled.')
+
+    celery.set_default()
+    app.extensions['celery'] = celery
+
+    return celery
+
 
 def create_app(config=None):
     app = Flask(__name__)
+    app.request_class = StreamRequest
+    app.json = ORJSONProvider(app)
     CORS(app)
 
     if config is None:
@@ -34,6 +81,31 @@ def create_app(config=None):
 
     app.logger.info('SITE_URL: {}'.format(app.config['SITE_URL']))
 
+    if 'ALLOWED_DOMAINS' in app.config.keys():
+        # set lookups for URL validation
+        app.config['ALLOWED_DOMAINS'] = frozenset(
+                app.config['ALLOWED_DOMAINS'])
+
+    if max_content_length := getenv('MAX_CONTENT_LENGTH'):
+        app.logger.info('Using MAX_CONTENT_LENGTH from ENV.')
+        app.config['MAX_CONTENT_LENGTH'] = int(max_content_length)
+
+    if getenv('USE_X_SENDFILE', '').lower() in ('1', 'true', 'yes'):
+        app.logger.info('Using X-Sendfile for exports.')
+        app.config['USE_X_SENDFILE'] = True
+
+    if app.config.get('USE_X_SENDFILE') and \
+            not app.config.get('X_ACCEL_REDIRECT'):
+        app.logger.warning('USE_X_SENDFILE is set without X_ACCEL_REDIRECT, '
+                           'exports require a X-Sendfile capable server.')
+
+    if broker_url := getenv('CELERY_BROKER_URL'):
+        app.config['CELERY_BROKER_URL'] = broker_url
+    if result_backend := getenv('CELERY_RESULT_BACKEND'):
+        app.config['CELERY_RESULT_BACKEND'] = result_backend
+
+    celery_init_app(app)
+
     if SENTRY_DSN:
         sentry_init(
                 dsn=SENTRY_DSN,
@@ -1,158 +1,352 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from os.path import basename
+from re import compile as re_compile, escape
+from shutil import rmtree
+from uuid import uuid4
+
+from celery.result import AsyncResult
+from decorator import decorator
 from flask import (
         Blueprint, current_app, jsonify, make_response, request,
         send_from_directory)
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
 
+from at.tasks import (
+        idnits_task, render_task, validate_task, PROCESSOR_ERRORS,
+        PROCESSOR_EXCEPTIONS, RENDERERS)
 from at.utils.abnf import extract_abnf, parse_abnf
 from at.utils.authentication import require_api_key
+from at.utils.cache import (
+        clear_pending, get_cached, get_digest, get_pending, SingleFlight,
+        PENDING_TIMEOUT)
 from at.utils.file import (
         check_file, get_file, get_name, get_name_with_revision, save_file,
-        save_file_from_text, DownloadError)
-from at.utils.iddiff import get_id_diff, IddiffError
-from at.utils.logs import update_logs
+        save_file_from_text, save_file_from_url)
+from at.utils.iddiff import get_id_diff
 from at.utils.net import (
-        get_both, get_latest, get_previous, is_valid_url, is_url, InvalidURL,
-        DocumentNotFound)
-from at.utils.processor import (
-        clean_svg_ids as clean_svg, get_html, get_pdf, get_text, get_xml,
-        process_file, KramdownError, MmarkError, TextError, XML2RFCError)
+        get_both, get_latest, get_previous, is_valid_url, is_url)
+from at.utils.processor import clean_svg_ids as clean_svg
 from at.utils.text import (
         get_text_id_from_file, get_text_id_from_url, TextProcessingError)
 from at.utils.validation import (
-        idnits as get_idnits, idnits3 as get_idnits3, svgcheck as get_svgcheck,
-        validate_draft)
+        idnits3 as get_idnits3, svgcheck as get_svgcheck)
 
+ACCEPTED = 202
 BAD_REQUEST = 400
+NOT_FOUND = 404
+REQUEST_ENTITY_TOO_LARGE = 413
 
 bp = Blueprint('api', __name__, url_prefix='/api')
+inflight = SingleFlight(timeout=PENDING_TIMEOUT)
 
 
-@bp.route('/render/<format>', methods=('POST',))
-@require_api_key
-@check_file
-def render(format):
-    '''POST: /render/<format> API call
-    Returns rendered format of the given input file.
-    Returns JSON on event of an error.'''
+class ApiBadRequest(HTTPException):
+    '''Bad request with an error message for the JSON response'''
+    code = BAD_REQUEST
 
-    logger = current_app.logger
 
-    if 'file' not in request.files:
-        logger.info('no input file')
-        return jsonify(error='No file'), BAD_REQUEST
+@decorator
+def translate_processor_errors(f, *args, **kwargs):
+    '''Returns the function result.
+    Raises ApiBadRequest with an error message on processor errors.'''
 
-    file = request.files['file']
+    try:
+        return f(*args, **kwargs)
+    except PROCESSOR_EXCEPTIONS as e:
+        for error, message in PROCESSOR_ERRORS:
+            if isinstance(e, error):
+                raise ApiBadRequest(message.format(e)) from e
 
-    logs = {'errors': [], 'warnings': []}
 
-    try:
-        dir_path, filename = process_file(
-                file=file,
-                upload_dir=current_app.config['UPLOAD_DIR'],
-                logger=logger)
-    except KramdownError as e:
-        return jsonify(
-                error='kramdown-rfc error: {}'.format(e)), BAD_REQUEST
-    except MmarkError as e:
-        return jsonify(
-                error='mmark error: {}'.format(e)), BAD_REQUEST
-    except TextError as e:
-        return jsonify(error='id2xml error: {}'.format(e)), BAD_REQUEST
+def _get_upload(key='file'):
+    '''Returns uploaded file with the given key.
+    Raises ApiBadRequest if the file is missing.'''
 
-    try:
-        xml_file, _logs = get_xml(filename, logger=logger)
-        logs = update_logs(logs, _logs)
-    except XML2RFCError as e:
-        return jsonify(error='xml2rfc error: {}'.format(e)), BAD_REQUEST
+    if key not in request.files:
+        current_app.logger.info('no input file')
+        raise ApiBadRequest('No file')
+
+    return request.files[key]
+
+
+def _accept_upload(key='file', processor=save_file, **kwargs):
+    '''Process uploaded file with the given processor and returns
+    (dir_path, filename).
+    Raises ApiBadRequest if the file is missing.'''
+
+    return processor(_get_upload(key),
+                     upload_dir=current_app.config['UPLOAD_DIR'],
+                     **kwargs)
 
-    rendered_filename = ''
+
+def _resolve_source(doc, url, dt_latest_url, allowed_domains, cache_ttl,
+                    logger):
+    '''Returns URL of the given document name or URL.
+    Returns None if neither is given, i.e. the source is an uploaded file.'''
+
+    if doc:
+        return get_latest(doc, dt_latest_url, logger, cache_ttl=cache_ttl)
+    if url:
+        is_valid_url(url, allowed_domains, logger)
+        return url
+
+    return None
+
+
+def _fetch_source(executor, url, key, upload_dir, raw, logger):
+    '''Submit fetching text draft of the given URL to the executor.
+    Uploaded file with the given key is used if URL is not given.
+    Returns (future, source type).'''
+
+    if url:
+        return (executor.submit(get_text_id_from_url,
+                                url,
+                                upload_dir,
+                                raw=raw,
+                                logger=logger),
+                'document')
+
+    return (executor.submit(get_text_id_from_file,
+                            _get_upload(key),
+                            upload_dir,
+                            raw=raw,
+                            logger=logger),
+            'draft')
+
+
+def _get_source(fetch, position):
+    '''Returns (dir_path, filename) of the fetched text draft.
+    Raises ApiBadRequest if the text conversion fails.'''
+
+    future, source = fetch
 
     try:
-        if format == 'xml':
-            rendered_filename = get_file(xml_file)
-        elif format == 'html':
-            html_file, _logs = get_html(xml_file, logger=logger)
-            logs = update_logs(logs, _logs)
-            rendered_filename = get_file(html_file)
-        elif format == 'text':
-            text_file, _logs = get_text(xml_file, logger=logger)
-            logs = update_logs(logs, _logs)
-            rendered_filename = get_file(text_file)
-        elif format == 'pdf':
-            pdf_file, _logs = get_pdf(xml_file, logger=logger)
-            logs = update_logs(logs, _logs)
-            rendered_filename = get_file(pdf_file)
+        return future.result()
+    except TextProcessingError as e:
+        raise ApiBadRequest('Error converting {} {} to text: {}'.format(
+                                                        position, source, e))
+
+
+def _get_previous_source(filename, latest, dt_latest_url, cache_ttl,
+                         logger):
+    '''Returns URL of the previous revision of the given draft.
+    Returns URL of the latest revision if latest is set or if the filename
+    doesn't have a revision.'''
+
+    filename = basename(filename)
+    document_name = get_name(filename)
+    original_doc_name = get_name_with_revision(filename)
+
+    if document_name is None:
+        logger.error('Can not determine draft name for {}'.format(filename))
+        raise ApiBadRequest('Can not determine draft/rfc')
+
+    if latest or original_doc_name == document_name:
+        return get_latest(document_name, dt_latest_url, logger,
+                          cache_ttl=cache_ttl)
+    else:
+        return get_previous(original_doc_name, dt_latest_url, logger,
+                            cache_ttl=cache_ttl)
+
+
+def get_cached_result(filename, process):
+    '''Returns cache digest and cached result for the given file.
+    Returns (None, None) if the cache is disabled.'''
+
+    config = current_app.config
+
+    if not config.get('CACHE_DIR'):
+        return (None, None)
+
+    digest = get_digest(filename,
+                        process,
+                        versions=[config.get('VERSION'),
+                                  config.get('VERSION_INFORMATION')],
+                        date=date.today().isoformat())
+    result = get_cached(digest,
+                        cache_dir=config['CACHE_DIR'],
+                        upload_dir=config['UPLOAD_DIR'],
+                        logger=current_app.logger)
+
+    return (digest, result)
+
+
+def submit_task(task, dir_path, digest, *args):
+    '''Returns result of the given task for the given arguments.
+    Concurrent requests with the same digest share the task result.'''
+
+    if not digest:
+        return task.delay(*args)
+
+    config = current_app.config
+    celery = current_app.extensions['celery']
+
+    if celery.conf.task_always_eager:
+        # tasks run within the request, share them within the process
+        result, shared = inflight.do(digest, task.delay, *args)
+    else:
+        # queued tasks are shared across processes via the cache index
+        task_id = str(uuid4())
+        pending_task_id = get_pending(
+                digest,
+                task_id,
+                cache_dir=config['CACHE_DIR'],
+                timeout=config.get('PENDING_TASK_TIMEOUT', PENDING_TIMEOUT))
+        shared = pending_task_id != task_id
+        if shared:
+            result = AsyncResult(pending_task_id, app=celery)
         else:
-            logger.info(
-                    'render format not supported: {}'.format(format))
-            return jsonify(
-                    error='Render format not supported'), BAD_REQUEST
-    except XML2RFCError as e:
-        return jsonify(error='xml2rfc error: {}'.format(e)), BAD_REQUEST
-
-    if len(rendered_filename) > 0:
+            try:
+                result = task.apply_async(args, task_id=task_id)
+            except Exception:
+                # task is not queued
+                clear_pending(task_id, cache_dir=config['CACHE_DIR'])
+                raise
+
+    if shared:
+        current_app.logger.info('sharing in-flight task: {}'.format(digest))
+        rmtree(dir_path, ignore_errors=True)
+
+    return result
+
+
+def conditional_response(response):
+    '''Returns response with an ETag.
+    Returns 304 response if the request If-None-Match matches the ETag.'''
+
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+def task_response(result):
+    '''Returns response for the given task result.
+    Returns JSON with the task status URL if the task is not completed.'''
+
+    if not result.ready():
         url = '/'.join((current_app.config['SITE_URL'],
                         'api',
-                        'export',
-                        rendered_filename))
+                        'status',
+                        result.id))
+        return jsonify(
+                task_id=result.id,
+                state=result.state,
+                url=url), ACCEPTED
+
+    # task errors are raised here, see translate_processor_errors
+    output = result.get()
+
+    if isinstance(output, str):
+        response = make_response(output)
+        response.headers['Content-Type'] = 'text/plain; charset=UTF-8'
+        return conditional_response(response)
+    else:
+        return jsonify(output)
+
+
+@bp.errorhandler(ApiBadRequest)
+def bad_request(error):
+    '''Returns JSON error for bad requests'''
+
+    return jsonify(error=error.description), BAD_REQUEST
+
 
-    return jsonify(
-                url=url,
-                logs=logs)
+@bp.errorhandler(RequestEntityTooLarge)
+def request_entity_too_large(error):
+    '''Returns JSON error when the request exceeds MAX_CONTENT_LENGTH'''
+
+    current_app.logger.info('request is too large')
+    return jsonify(error='Input file is too large'), REQUEST_ENTITY_TOO_LARGE
+
+
+@bp.route('/render/<format>', methods=('POST',))
+@require_api_key
+@check_file
+@translate_processor_errors
+def render(format):
+    '''POST: /render/<format> API call
+    Returns rendered format of the given input file.
+    Returns JSON on event of an error.'''
+
+    if 'file' in request.files and format not in RENDERERS:
+        current_app.logger.info(
+                'render format not supported: {}'.format(format))
+        raise ApiBadRequest('Render format not supported')
+
+    dir_path, filename = _accept_upload('file')
+
+    digest, result = get_cached_result(filename, format)
+    if result:
+        rmtree(dir_path, ignore_errors=True)
+        return jsonify(result)
+
+    return task_response(submit_task(render_task,
+                                     dir_path,
+                                     digest,
+                                     filename,
+                                     format,
+                                     digest))
 
 
 @bp.route('/export/<dir>/<file>', methods=('GET',))
 @require_api_key
 def export(dir, file):
+    config = current_app.config
     as_attachment = request.values.get('download', False)
     dir = dir.replace('.', '')
     dir = dir.replace('/', '')
     file = file.replace('/', '')
-    dir_path = '/'.join((current_app.config['UPLOAD_DIR'], dir))
-    return send_from_directory(
+    dir_path = '/'.join((config['UPLOAD_DIR'], dir))
+    response = send_from_directory(
                 dir_path,
                 get_file(file),
-                as_attachment=as_attachment)
+                as_attachment=as_attachment,
+                conditional=True,
+                etag=True)
+
+    if x_accel_redirect := config.get('X_ACCEL_REDIRECT'):
+        # nginx serves the file from the internal location
+        if response.headers.pop('X-Sendfile', None):
+            response.headers['X-Accel-Redirect'] = '/'.join((
+                                                x_accel_redirect,
+                                                dir,
+                                                get_file(file)))
+
+    return response
 
 
 @bp.route('/validate', methods=('POST',))
 @require_api_key
 @check_file
+@translate_processor_errors
 def validate():
     '''POST: /validate API call
     Returns JSON with errors, warnings and informational output'''
 
-    logger = current_app.logger
+    dir_path, filename = _accept_upload('file')
 
-    if 'file' not in request.files:
-        logger.info('no input file')
-        return jsonify(error='No file'), BAD_REQUEST
+    digest, result = get_cached_result(filename, 'validate')
+    if result:
+        rmtree(dir_path, ignore_errors=True)
+        return jsonify(result)
 
-    file = request.files['file']
-
-    try:
-        log = validate_draft(file=file,
-                             upload_dir=current_app.config['UPLOAD_DIR'],
-                             logger=logger)
-    except KramdownError as e:
-        return jsonify(
-                error='kramdown-rfc error: {}'.format(e)), BAD_REQUEST
-    except MmarkError as e:
-        return jsonify(
-                error='mmark error: {}'.format(e)), BAD_REQUEST
-    except XML2RFCError as e:
-        return jsonify(error='xml2rfc error: {}'.format(e)), BAD_REQUEST
-
-    return jsonify(log)
+    return task_response(submit_task(validate_task,
+                                     dir_path,
+                                     digest,
+                                     filename,
+                                     digest))
 
 
 @bp.route('/idnits', methods=('GET', 'POST'))
 @require_api_key
 @check_file
+@translate_processor_errors
 def idnits():
     '''GET/POST: /idnits API call
     Returns idnits output'''
 
     logger = current_app.logger
+    config = current_app.config
 
     url = request.values.get('url', '').strip()
     verbose = request.values.get('verbose', '0').strip()
@@ -167,60 +361,36 @@ def idnits():
         submit_check = False
 
     if request.method == 'POST':
-        if 'file' not in request.files:
-            logger.info('no input file')
-            return jsonify(error='No file'), BAD_REQUEST
-
-        file = request.files['file']
-
-        try:
-            _, filename = get_text_id_from_file(
-                    file=file,
-                    upload_dir=current_app.config['UPLOAD_DIR'],
-                    logger=logger)
-        except TextProcessingError as e:
-            return jsonify(error=str(e)), BAD_REQUEST
+        dir_path, filename = _accept_upload('file')
     else:
         if url == '':
             logger.info('URL is missing')
-            return jsonify(error='URL is missing'), BAD_REQUEST
-
-        try:
-            if is_valid_url(url,
-                            current_app.config['ALLOWED_DOMAINS'],
-                            logger):
-                _, filename = get_text_id_from_url(
-                                            url,
-                                            current_app.config['UPLOAD_DIR'],
-                                            logger=logger)
-        except TextProcessingError as e:
-            return jsonify(error=str(e)), BAD_REQUEST
-        except InvalidURL as e:
-            return jsonify(error=str(e)), BAD_REQUEST
-        except DownloadError as e:
-            return jsonify(error=str(e)), BAD_REQUEST
-
-    output = get_idnits(filename,
-                        logger=logger,
-                        verbose=verbose,
-                        show_text=show_text,
-                        year=year,
-                        submit_check=submit_check)
+            raise ApiBadRequest('URL is missing')
 
-    response = make_response(output)
-    response.headers['Content-Type'] = 'text/plain; charset=UTF-8'
+        is_valid_url(url, config['ALLOWED_DOMAINS'], logger)
+        dir_path, filename = save_file_from_url(
+                                        url,
+                                        config['UPLOAD_DIR'],
+                                        logger=logger)
 
-    return response
+    return task_response(idnits_task.delay(dir_path,
+                                           filename,
+                                           verbose=verbose,
+                                           show_text=show_text,
+                                           year=year,
+                                           submit_check=submit_check))
 
 
 @bp.route('/idnits3', methods=('GET', 'POST'))
 @require_api_key
 @check_file
+@translate_processor_errors
 def idnits3():
     '''GET/POST: /idnits3 API call
     Returns idnits3 output'''
 
     logger = current_app.logger
+    config = current_app.config
 
     url = request.values.get('url', '').strip()
     year = request.values.get('year', '').strip()
@@ -230,40 +400,21 @@ def idnits3():
         submit_check = False
 
     if request.method == 'POST':
-        if 'file' not in request.files:
-            logger.info('no input file')
-            return jsonify(error='No file'), BAD_REQUEST
-
-        file = request.files['file']
-
-        try:
-            _, filename = get_text_id_from_file(
-                    file=file,
-                    text_or_xml=True,
-                    upload_dir=current_app.config['UPLOAD_DIR'],
-                    logger=logger)
-        except TextProcessingError as e:
-            return jsonify(error=str(e)), BAD_REQUEST
+        _, filename = _accept_upload('file',
+                                     processor=get_text_id_from_file,
+                                     text_or_xml=True,
+                                     logger=logger)
     else:
         if url == '':
             logger.info('URL is missing')
-            return jsonify(error='URL is missing'), BAD_REQUEST
-
-        try:
-            if is_valid_url(url,
-                            current_app.config['ALLOWED_DOMAINS'],
-                            logger):
-                _, filename = get_text_id_from_url(
-                                            url,
-                                            current_app.config['UPLOAD_DIR'],
-                                            text_or_xml=True,
-                                            logger=logger)
-        except TextProcessingError as e:
-            return jsonify(error=str(e)), BAD_REQUEST
-        except InvalidURL as e:
-            return jsonify(error=str(e)), BAD_REQUEST
-        except DownloadError as e:
-            return jsonify(error=str(e)), BAD_REQUEST
+            raise ApiBadRequest('URL is missing')
+
+        if is_valid_url(url, config['ALLOWED_DOMAINS'], logger):
+            _, filename = get_text_id_from_url(
+                                        url,
+                                        config['UPLOAD_DIR'],
+                                        text_or_xml=True,
+                                        logger=logger)
 
     output = get_idnits3(filename,
                          logger=logger,
@@ -273,18 +424,24 @@ def idnits3():
     response = make_response(output)
     response.headers['Content-Type'] = 'text/plain; charset=UTF-8'
 
-    return response
+    return conditional_response(response)
 
 
 @bp.route('/iddiff', methods=('POST', 'GET'))
 @require_api_key
 @check_file
+@translate_processor_errors
 def id_diff():
     '''POST: /iddiff API call
     Returns HTML output of ID diff
     Returns JSON on event of an error.'''
 
     logger = current_app.logger
+    config = current_app.config
+    upload_dir = config['UPLOAD_DIR']
+    allowed_domains = config.get('ALLOWED_DOMAINS')
+    dt_latest_url = config.get('DT_LATEST_DRAFT_URL')
+    cache_ttl = config.get('DT_LATEST_CACHE_TTL')
 
     doc_1 = request.values.get('doc_1', '').strip()
     doc_2 = request.values.get('doc_2', '').strip()
@@ -364,203 +521,100 @@ def id_diff():
         doc = doc_1 if doc_1 else doc_2
         if not doc:
             logger.info('no documents to compare')
-            return jsonify(error='No documents to compare'), BAD_REQUEST
+            raise ApiBadRequest('No documents to compare')
         doc_1 = doc_2 = ''
-        try:
-            url_1, url_2 = get_both(doc,
-                                    current_app.config['DT_LATEST_DRAFT_URL'],
-                                    logger)
-        except DocumentNotFound as e:
-            return jsonify(error=str(e)), BAD_REQUEST
-
-    single_draft = False
-
-    if not doc_1 and not url_1:
-        file_1 = request.files['file_1']
-
-        try:
-            dir_path_1, filename_1 = get_text_id_from_file(
-                    file=file_1,
-                    upload_dir=current_app.config['UPLOAD_DIR'],
-                    raw=raw,
-                    logger=logger)
-        except TextProcessingError as e:
-            error = 'Error converting first draft to text: {}' \
-                    .format(str(e))
-            return jsonify(error=error), BAD_REQUEST
-    else:
-        if doc_1:
-            try:
-                url_1 = get_latest(doc_1,
-                                   current_app.config['DT_LATEST_DRAFT_URL'],
-                                   logger)
-            except DocumentNotFound as e:
-                return jsonify(error=str(e)), BAD_REQUEST
-        else:
-            try:
-                is_valid_url(url_1,
-                             current_app.config['ALLOWED_DOMAINS'],
-                             logger)
-            except InvalidURL as e:
-                return jsonify(error=str(e)), BAD_REQUEST
-
-        try:
-            dir_path_1, filename_1 = get_text_id_from_url(
-                                            url_1,
-                                            current_app.config['UPLOAD_DIR'],
-                                            raw=raw,
-                                            logger=logger)
-        except DownloadError as e:
-            return jsonify(error=str(e)), BAD_REQUEST
-        except TextProcessingError as e:
-            error = 'Error converting first document to text: {}' \
-                    .format(str(e))
-            return jsonify(error=str(error)), BAD_REQUEST
-
-    if not doc_2 and not url_2 and 'file_2' in request.files:
-        file_2 = request.files['file_2']
-
-        try:
-            dir_path_2, filename_2 = get_text_id_from_file(
-                    file=file_2,
-                    upload_dir=current_app.config['UPLOAD_DIR'],
-                    raw=raw,
-                    logger=logger)
-        except TextProcessingError as e:
-            error = 'Error converting second draft to text: {}' \
-                    .format(str(e))
-            return jsonify(error=error), BAD_REQUEST
-    else:
-        if url_2:
-            try:
-                is_valid_url(url_2,
-                             current_app.config['ALLOWED_DOMAINS'],
-                             logger)
-            except InvalidURL as e:
-                return jsonify(error=str(e)), BAD_REQUEST
-        elif doc_2:
-            try:
-                url_2 = get_latest(doc_2,
-                                   current_app.config['DT_LATEST_DRAFT_URL'],
-                                   logger)
-            except DocumentNotFound as e:
-                return jsonify(error=str(e)), BAD_REQUEST
-        else:
-            filename = filename_1.split('/')[-1]
-            document_name = get_name(filename)
-            original_doc_name = get_name_with_revision(filename)
-
-            if original_doc_name == document_name:
-                # document doesn't have a revision in the file name
-                # compare with the latest
-                latest = True
-
-            if document_name is None:
-                logger.error('Can not determine draft name for {}'.format(
-                                                            filename))
-                return (jsonify(error='Can not determine draft/rfc'),
-                        BAD_REQUEST)
-            else:
-                try:
-                    if latest:
-                        url_2 = get_latest(
-                                document_name,
-                                current_app.config['DT_LATEST_DRAFT_URL'],
-                                logger)
-                    else:
-                        url_2 = get_previous(
-                                original_doc_name,
-                                current_app.config['DT_LATEST_DRAFT_URL'],
+        url_1, url_2 = get_both(doc, dt_latest_url, logger)
+
+    url_1 = _resolve_source(doc_1, url_1, dt_latest_url, allowed_domains,
+                            cache_ttl, logger)
+    # URL takes precedence over the document name for the second document
+    url_2 = _resolve_source('' if url_2 else doc_2, url_2, dt_latest_url,
+                            allowed_domains, cache_ttl, logger)
+    # compare with the previous or the latest revision of the first draft
+    single_draft = not url_2 and 'file_2' not in request.files
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # fetch both documents concurrently
+        fetch_1 = _fetch_source(executor, url_1, 'file_1', upload_dir, raw,
                                 logger)
-                    single_draft = True
-                except DocumentNotFound as e:
-                    return jsonify(error=str(e)), BAD_REQUEST
-        try:
-            dir_path_2, filename_2 = get_text_id_from_url(
-                                            url_2,
-                                            current_app.config['UPLOAD_DIR'],
-                                            raw=raw,
-                                            logger=logger)
-        except DownloadError as e:
-            return jsonify(error=str(e)), BAD_REQUEST
-        except TextProcessingError as e:
-            error = 'Error converting second document to text: {}' \
-                    .format(str(e))
-            return jsonify(error=str(error)), BAD_REQUEST
+        if not single_draft:
+            fetch_2 = _fetch_source(executor, url_2, 'file_2', upload_dir,
+                                    raw, logger)
+
+        dir_path_1, filename_1 = _get_source(fetch_1, 'first')
 
-    try:
         if single_draft:
-            old_draft = filename_2
-            new_draft = filename_1
-        else:
-            old_draft = filename_1
-            new_draft = filename_2
-        iddiff = get_id_diff(old_draft=old_draft,
-                             new_draft=new_draft,
-                             diff_tool=diff_tool,
-                             table=table,
-                             wdiff=wdiff,
-                             chbars=chbars,
-                             abdiff=abdiff,
-                             logger=logger)
-        for dir_path in (dir_path_1, dir_path_2):
-            iddiff = iddiff.replace('{}/'.format(dir_path), '')
-        if chbars or abdiff:
-            response = make_response(iddiff)
-            response.headers['Content-Type'] = 'text/plain; charset=UTF-8'
-            return response
-        else:
-            return iddiff
-    except IddiffError as e:  # pragma: no cover
-        return jsonify(error='iddiff error: {}'.format(e)), BAD_REQUEST
+            url_2 = _get_previous_source(filename_1, latest, dt_latest_url,
+                                         cache_ttl, logger)
+            fetch_2 = _fetch_source(executor, url_2, 'file_2', upload_dir,
+                                    raw, logger)
+
+        dir_path_2, filename_2 = _get_source(fetch_2, 'second')
+
+    if single_draft:
+        old_draft = filename_2
+        new_draft = filename_1
+    else:
+        old_draft = filename_1
+        new_draft = filename_2
+
+    iddiff = get_id_diff(old_draft=old_draft,
+                         new_draft=new_draft,
+                         diff_tool=diff_tool,
+                         table=table,
+                         wdiff=wdiff,
+                         chbars=chbars,
+                         abdiff=abdiff,
+                         logger=logger)
+    # remove temporary directory paths from the output in one pass
+    dir_paths = re_compile('|'.join(
+            escape('{}/'.format(dir_path))
+            for dir_path in (dir_path_1, dir_path_2)))
+    iddiff = dir_paths.sub('', iddiff)
+
+    if chbars or abdiff:
+        response = make_response(iddiff)
+        response.headers['Content-Type'] = 'text/plain; charset=UTF-8'
+        return response
+    else:
+        return iddiff
 
 
 @bp.route('/abnf/extract', methods=('GET',))
 @require_api_key
+@translate_processor_errors
 def abnf_extract():
     '''GET: /abnf/extract API call
     Returns abnf extract'''
 
     logger = current_app.logger
+    config = current_app.config
+    cache_ttl = config.get('DT_LATEST_CACHE_TTL')
 
     url = request.values.get('url', '').strip()
     doc = request.values.get('doc', '').strip()
 
-    try:
-        if url != '':
-            if is_valid_url(url,
-                            current_app.config['ALLOWED_DOMAINS'],
-                            logger):
-                pass
-        elif doc != '':
-            url = get_latest(doc,
-                             current_app.config['DT_LATEST_DRAFT_URL'],
-                             logger)
-        else:
-            logger.info('URL/document is missing')
-            return jsonify(
-                    error='URL/document name must be provided'), BAD_REQUEST
+    if url != '':
+        is_valid_url(url, config['ALLOWED_DOMAINS'], logger)
+    elif doc != '':
+        url = get_latest(doc,
+                         config['DT_LATEST_DRAFT_URL'],
+                         logger,
+                         cache_ttl=cache_ttl)
+    else:
+        logger.info('URL/document is missing')
+        raise ApiBadRequest('URL/document name must be provided')
 
-        _, filename = get_text_id_from_url(
-                                            url,
-                                            current_app.config['UPLOAD_DIR'],
-                                            logger=logger)
+    _, filename = get_text_id_from_url(url,
+                                       config['UPLOAD_DIR'],
+                                       logger=logger)
 
-        output = extract_abnf(filename, logger=logger)
+    output = extract_abnf(filename, logger=logger)
 
-        response = make_response(output)
-        response.headers['Content-Type'] = 'text/plain; charset=UTF-8'
-
-        return response
+    response = make_response(output)
+    response.headers['Content-Type'] = 'text/plain; charset=UTF-8'
 
-    except DocumentNotFound as e:
-        return jsonify(error=str(e)), BAD_REQUEST
-    except DownloadError as e:
-        return jsonify(error=str(e)), BAD_REQUEST
-    except TextProcessingError as e:
-        return jsonify(error=str(e)), BAD_REQUEST
-    except InvalidURL as e:
-        return jsonify(error=str(e)), BAD_REQUEST
+    return conditional_response(response)
 
 
 @bp.route('/abnf/parse', methods=('POST',))
@@ -570,10 +624,11 @@ def abnf_parse():
     Parse ABNF input and returns results'''
 
     logger = current_app.logger
+    config = current_app.config
 
     input = request.values.get('input', '')
     _, filename = save_file_from_text(input,
-                                      current_app.config['UPLOAD_DIR'])
+                                      config['UPLOAD_DIR'])
 
     errors, abnf = parse_abnf(filename, logger=logger)
 
@@ -591,13 +646,7 @@ def svgcheck():
 
     logger = current_app.logger
 
-    if 'file' not in request.files:
-        logger.info('no input file')
-        return jsonify(error='No file'), BAD_REQUEST
-
-    file = request.files['file']
-
-    _, filename = save_file(file, current_app.config['UPLOAD_DIR'])
+    _, filename = _accept_upload('file')
 
     svg, result, errors = get_svgcheck(filename, logger=logger)
 
@@ -616,13 +665,7 @@ def clean_svg_ids():
 
     logger = current_app.logger
 
-    if 'file' not in request.files:
-        logger.info('no input file')
-        return jsonify(error='No file'), BAD_REQUEST
-
-    file = request.files['file']
-
-    _, filename = save_file(file, current_app.config['UPLOAD_DIR'])
+    _, filename = _accept_upload('file')
 
     xml_file = clean_svg(filename, logger=logger)
 
@@ -636,14 +679,33 @@ def clean_svg_ids():
     return jsonify(url=url)
 
 
+@bp.route('/status/<task_id>', methods=('GET',))
+@require_api_key
+@translate_processor_errors
+def status(task_id):
+    '''GET: /status/<task_id> API call
+    Returns result of the given task once the task is completed.
+    Returns JSON with the task state while the task is in progress.'''
+
+    celery = current_app.extensions['celery']
+
+    if celery.conf.task_always_eager:
+        # tasks are not queued without a broker
+        current_app.logger.info('task queue is disabled')
+        return jsonify(error='Task not found'), NOT_FOUND
+
+    return task_response(AsyncResult(task_id, app=celery))
+
+
 @bp.route('/version', methods=('GET',))
 def version():
     '''GET: /version API call
     Returns JSON with version information'''
 
     logger = current_app.logger
+    config = current_app.config
     logger.debug('version information request')
-    versions = current_app.config['VERSION_INFORMATION']
-    versions['author_tools_api'] = current_app.config['VERSION']
+    versions = dict(config['VERSION_INFORMATION'])
+    versions['author_tools_api'] = config['VERSION']
 
-    return jsonify(versions=versions)
+    return conditional_response(jsonify(versions=versions))
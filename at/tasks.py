@@ -0,0 +1,128 @@
+from celery import current_task, shared_task
+from decorator import decorator
+from flask import current_app
+
+from at.utils.cache import clear_pending, set_cached
+from at.utils.file import get_file, DownloadError
+from at.utils.iddiff import IddiffError
+from at.utils.logs import update_logs
+from at.utils.net import DocumentNotFound, InvalidURL
+from at.utils.processor import (
+        convert_file, get_html, get_pdf, get_text, get_xml, KramdownError,
+        MmarkError, TextError, XML2RFCError)
+from at.utils.text import get_text_id, TextProcessingError
+from at.utils.validation import idnits as get_idnits, validate_file
+
+# errors caused by the input, with the error message format
+PROCESSOR_ERRORS = (
+        (KramdownError, 'kramdown-rfc error: {}'),
+        (MmarkError, 'mmark error: {}'),
+        (TextError, 'id2xml error: {}'),
+        (XML2RFCError, 'xml2rfc error: {}'),
+        (TextProcessingError, '{}'),
+        (DocumentNotFound, '{}'),
+        (DownloadError, '{}'),
+        (InvalidURL, '{}'),
+        (IddiffError, 'iddiff error: {}'))
+# processor errors are expected task failures, not task crashes
+PROCESSOR_EXCEPTIONS = tuple(error for error, _ in PROCESSOR_ERRORS)
+# renderers for each render format, XML is not rendered
+RENDERERS = {
+        'xml': None,
+        'html': get_html,
+        'text': get_text,
+        'pdf': get_pdf}
+
+
+def cache_result(digest, result, file=None):
+    '''Cache task result for the given digest'''
+
+    config = current_app.config
+
+    set_cached(digest,
+               result,
+               cache_dir=config['CACHE_DIR'],
+               upload_dir=config['UPLOAD_DIR'],
+               file=file,
+               max_bytes=config.get('CACHE_MAX_BYTES'),
+               max_entries=config.get('CACHE_MAX_ENTRIES'),
+               logger=current_app.logger)
+
+
+@decorator
+def clear_pending_on_error(f, *args, **kwargs):
+    '''Returns the task result.
+    Clears the pending task entry if the task fails.'''
+
+    try:
+        return f(*args, **kwargs)
+    except Exception:
+        if cache_dir := current_app.config.get('CACHE_DIR'):
+            clear_pending(current_task.request.id, cache_dir=cache_dir)
+        raise
+
+
+@shared_task(throws=PROCESSOR_EXCEPTIONS)
+@clear_pending_on_error
+def render_task(filename, format, digest=None):
+    '''Render given saved file and returns export URL with logs.
+    Result is cached if digest is provided.'''
+
+    logger = current_app.logger
+
+    logs = {'errors': [], 'warnings': []}
+
+    filename = convert_file(filename, logger=logger)
+
+    xml_file, _logs = get_xml(filename, logger=logger)
+    logs = update_logs(logs, _logs)
+
+    if renderer := RENDERERS[format]:
+        rendered_file, _logs = renderer(xml_file, logger=logger)
+        logs = update_logs(logs, _logs)
+    else:
+        rendered_file = xml_file
+
+    rendered_filename = get_file(rendered_file)
+
+    url = '/'.join((current_app.config['SITE_URL'],
+                    'api',
+                    'export',
+                    rendered_filename))
+
+    result = {'url': url, 'logs': logs}
+
+    if digest:
+        cache_result(digest, result, rendered_filename)
+
+    return result
+
+
+@shared_task(throws=PROCESSOR_EXCEPTIONS)
+@clear_pending_on_error
+def validate_task(filename, digest=None):
+    '''Validate given saved file and returns validation logs.
+    Result is cached if digest is provided.'''
+
+    log = validate_file(filename, logger=current_app.logger)
+
+    if digest:
+        cache_result(digest, log)
+
+    return log
+
+
+@shared_task(throws=PROCESSOR_EXCEPTIONS)
+def idnits_task(dir_path, filename, verbose, show_text, year, submit_check):
+    '''Run idnits on given saved file and returns idnits output'''
+
+    logger = current_app.logger
+
+    _, filename = get_text_id(dir_path, filename, logger)
+
+    return get_idnits(filename,
+                      logger=logger,
+                      verbose=verbose,
+                      show_text=show_text,
+                      year=year,
+                      submit_check=submit_check)
@@ -1,7 +1,10 @@
 from decorator import decorator
 from flask import current_app, jsonify, request
-from requests import post
+from requests.exceptions import ConnectionError, Timeout
 
+from at.utils.net import session, TIMEOUT
+
+BAD_REQUEST = 400
 UNAUTHORIZED = 401
 OK = 200
 
@@ -24,8 +27,18 @@ def require_api_key(f, *args, **kwargs):
                 logger.error('missing api key')
                 return jsonify(error='API key is missing'), UNAUTHORIZED
 
-        with post(config['DT_APPAUTH_URL'],
-                  data={'apikey': apikey.strip()}) as response:
+        try:
+            response = session.post(config['DT_APPAUTH_URL'],
+                                    data={'apikey': apikey.strip()},
+                                    timeout=TIMEOUT)
+        except (ConnectionError, Timeout) as e:
+            logger.error('Connection error on {url}: {error}'.format(
+                                                url=config['DT_APPAUTH_URL'],
+                                                error=e))
+            return jsonify(error='Can not connect to datatracker to validate '
+                                 'API key'), BAD_REQUEST
+
+        with response:
             if (response.status_code == OK and
                     response.json()['success'] is True):
                 logger.debug('valid apikey')
@@ -0,0 +1,181 @@
+from concurrent.futures import Future, TimeoutError
+from contextlib import closing
+from hashlib import sha256
+from json import dumps, loads
+from logging import getLogger
+from os import makedirs, path
+from shutil import rmtree
+from sqlite3 import connect
+from threading import Lock
+from time import time
+
+CACHE_DB = 'cache.sqlite3'
+CHUNK_SIZE = 1 << 20  # 1 MiB
+DIR_MODE = 0o770
+PENDING_TIMEOUT = 600  # seconds
+
+
+class SingleFlight:
+    '''Runs one call at a time for each key.
+    Concurrent calls with the same key wait for and share the result of the
+    running call. Calls that wait longer than timeout seconds run
+    themselves.'''
+
+    def __init__(self, timeout=None):
+        self.calls = {}
+        self.lock = Lock()
+        self.timeout = timeout
+
+    def do(self, key, function, *args, **kwargs):
+        '''Returns (result, shared) for the given function call.
+        shared is True if the result is from a call made by another caller.'''
+
+        with self.lock:
+            shared = key in self.calls
+            if shared:
+                call = self.calls[key]
+            else:
+                call = self.calls[key] = Future()
+
+        if shared:
+            try:
+                return (call.result(timeout=self.timeout), True)
+            except TimeoutError:
+                return (function(*args, **kwargs), False)
+
+        try:
+            result = function(*args, **kwargs)
+            call.set_result(result)
+            return (result, False)
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+
+
+def get_digest(filename, process, versions=None, date=None):
+    '''Returns SHA-256 digest of the given file for the given process.
+    NOTE: versions are included in the digest so that tool upgrades
+    invalidate cached results. date is included as outputs depend on the
+    current date (document dates, expiry dates and idnits checks).'''
+
+    digest = sha256()
+    digest.update('\n'.join([
+        process,
+        path.basename(filename),
+        dumps(versions, sort_keys=True),
+        str(date)]).encode('utf-8'))
+
+    with open(filename, 'rb') as file:
+        while chunk := file.read(CHUNK_SIZE):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def get_db(cache_dir):
+    '''Returns cache index database connection'''
+
+    makedirs(cache_dir, mode=DIR_MODE, exist_ok=True)
+    db = connect(path.join(cache_dir, CACHE_DB), timeout=30)
+    db.execute('CREATE TABLE IF NOT EXISTS cache ('
+               'digest TEXT PRIMARY KEY, result TEXT, path TEXT, '
+               'size INTEGER, atime REAL)')
+    db.execute('CREATE TABLE IF NOT EXISTS pending ('
+               'digest TEXT PRIMARY KEY, task_id TEXT, ctime REAL)')
+
+    return db
+
+
+def get_cached(digest, cache_dir, upload_dir, logger=getLogger()):
+    '''Returns cached result for the given digest or None'''
+
+    with closing(get_db(cache_dir)) as db, db:
+        row = db.execute(
+                'SELECT result, path FROM cache WHERE digest = ?',
+                (digest, )).fetchone()
+
+        if row is None:
+            return None
+
+        result, file = row
+        if file and not path.exists(path.join(upload_dir, file)):
+            logger.debug('cached file is missing: {}'.format(file))
+            db.execute('DELETE FROM cache WHERE digest = ?', (digest, ))
+            return None
+
+        db.execute(
+                'UPDATE cache SET atime = ? WHERE digest = ?',
+                (time(), digest))
+
+    logger.info('cache hit: {}'.format(digest))
+    return loads(result)
+
+
+def get_pending(digest, task_id, cache_dir, timeout=PENDING_TIMEOUT):
+    '''Returns task id of the pending task for the given digest.
+    task_id is registered as the pending task if there is no pending task
+    registered within timeout seconds.'''
+
+    with closing(get_db(cache_dir)) as db, db:
+        db.execute(
+                'DELETE FROM pending WHERE digest = ? AND ctime < ?',
+                (digest, time() - timeout))
+        db.execute(
+                'INSERT OR IGNORE INTO pending VALUES (?, ?, ?)',
+                (digest, task_id, time()))
+        (pending_task_id, ) = db.execute(
+                'SELECT task_id FROM pending WHERE digest = ?',
+                (digest, )).fetchone()
+
+    return pending_task_id
+
+
+def clear_pending(task_id, cache_dir):
+    '''Clears pending task entry of the given task'''
+
+    with closing(get_db(cache_dir)) as db, db:
+        db.execute('DELETE FROM pending WHERE task_id = ?', (task_id, ))
+
+
+def set_cached(digest, result, cache_dir, upload_dir, file=None,
+               max_bytes=None, max_entries=None, logger=getLogger()):
+    '''Cache result for the given digest.
+    file is the output file path relative to upload_dir, if any.
+    Least recently used entries are evicted when the total size of cached
+    files exceeds max_bytes or the number of entries exceeds max_entries.
+    Pending task for the digest is cleared.'''
+
+    size = 0
+    if file:
+        size = path.getsize(path.join(upload_dir, file))
+
+    with closing(get_db(cache_dir)) as db, db:
+        db.execute(
+                'INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)',
+                (digest, dumps(result), file, size, time()))
+        db.execute('DELETE FROM pending WHERE digest = ?', (digest, ))
+
+        if max_bytes is None and max_entries is None:
+            return
+
+        (total, count) = db.execute(
+                'SELECT COALESCE(SUM(size), 0), COUNT(*) FROM cache'
+                ).fetchone()
+        rows = db.execute(
+                'SELECT digest, path, size FROM cache WHERE digest != ? '
+                'ORDER BY atime', (digest, ))
+
+        for old_digest, old_file, old_size in rows.fetchall():
+            if (max_bytes is None or total <= max_bytes) and \
+                    (max_entries is None or count <= max_entries):
+                break
+            logger.debug('evicting from cache: {}'.format(old_digest))
+            db.execute('DELETE FROM cache WHERE digest = ?', (old_digest, ))
+            if old_file:
+                rmtree(path.join(upload_dir, path.dirname(old_file)),
+                       ignore_errors=True)
+            total -= old_size
+            count -= 1
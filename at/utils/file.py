@@ -1,25 +1,53 @@
+from io import UnsupportedOperation
 from logging import getLogger
-from os import mkdir, path
+from os import fstat, mkdir, path, sendfile
 from re import compile as re_compile
+from stat import S_ISREG
 from uuid import uuid4
 
 from decorator import decorator
-from flask import current_app, jsonify, request
-from requests import get
+from flask import current_app, jsonify, request, Request
 from requests.exceptions import ConnectionError, Timeout
+from werkzeug.datastructures import FileStorage, ImmutableMultiDict
 from werkzeug.utils import secure_filename
 
+from at.utils.net import session, TIMEOUT
 
-ALLOWED_EXTENSIONS = ('txt', 'xml', 'md', 'mkd',)
+
+ALLOWED_EXTENSIONS = frozenset(('txt', 'xml', 'md', 'mkd',))
 ALLOWED_EXTENSIONS_BY_PROCESS = {
-        'svgcheck': ('svg', ),
-        'clean_svg_ids': ('xml', ),
+        'svgcheck': frozenset(('svg', )),
+        'clean_svg_ids': frozenset(('xml', )),
         }
 DIR_MODE = 0o770
 DRAFT_NAME = re_compile(r'(-\d+)?(\..*)?$')
 DRAFT_NAME_WITH_REVISION = re_compile(r'\..*$')
 OK = 200
 BAD_REQUEST = 400
+STREAM_MIMETYPE = 'application/octet-stream'
+STREAM_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+
+class StreamRequest(Request):
+    '''Request class that accepts the request body as the input file.
+    Input file must be posted as application/octet-stream with the filename
+    as the filename query parameter.'''
+
+    def _load_form_data(self):
+        if 'form' in self.__dict__:
+            return
+
+        if self.mimetype == STREAM_MIMETYPE:
+            # the request body is the input file, not form data
+            self.__dict__['form'] = self.parameter_storage_class()
+            self.__dict__['files'] = ImmutableMultiDict({
+                'file': FileStorage(
+                    stream=self.stream,
+                    filename=self.args.get('filename', ''),
+                    name='file',
+                    content_type=self.content_type)})
+        else:
+            super()._load_form_data()
 
 
 # Exceptions
@@ -31,8 +59,9 @@ class DownloadError(Exception):
 def allowed_file(filename, process=None):
     '''Return true if file extension in allowed list'''
 
-    if '.' in filename:
-        ext = filename.rsplit('.', 1)[1].lower()
+    _, dot, ext = filename.rpartition('.')
+    if dot:
+        ext = ext.lower()
         if process:
             return ext in ALLOWED_EXTENSIONS_BY_PROCESS[process]
         else:
@@ -68,7 +97,27 @@ def save_file(file, upload_dir):
     filename = path.join(
             dir_path,
             secure_filename(file.filename))
-    file.save(filename)
+
+    try:
+        fileno = file.stream.fileno()
+    except (AttributeError, UnsupportedOperation):
+        fileno = None
+
+    if fileno is not None and S_ISREG(fstat(fileno).st_mode):
+        # copy within the kernel from the upload temporary file
+        offset = file.stream.tell()
+        try:
+            with open(filename, 'wb') as output:
+                while sent := sendfile(output.fileno(), fileno, offset,
+                                       STREAM_BUFFER_SIZE):
+                    offset += sent
+            return (dir_path, filename)
+        except OSError:
+            # sendfile only copies to regular files on Linux
+            pass
+
+    # in memory or streamed upload
+    file.save(filename, buffer_size=STREAM_BUFFER_SIZE)
 
     return (dir_path, filename)
 
@@ -102,10 +151,12 @@ def save_file_from_url(url, upload_dir, logger=getLogger()):
             save_filename)
 
     try:
-        with get(url) as response:
+        with session.get(url, stream=True, timeout=TIMEOUT) as response:
             if response.status_code == OK:
-                with open(filename, 'w') as file:
-                    file.write(response.text)
+                with open(filename, 'wb') as file:
+                    for chunk in response.iter_content(
+                            chunk_size=STREAM_BUFFER_SIZE):
+                        file.write(chunk)
             else:
                 logger.error('Error downloading file: {}'.format(url))
                 raise DownloadError('Error occured while downloading file.')
@@ -0,0 +1,17 @@
+from flask.json.provider import JSONProvider
+from orjson import dumps, loads, OPT_SORT_KEYS
+
+
+class ORJSONProvider(JSONProvider):
+    '''JSON provider that uses orjson for JSON responses.
+    NOTE: keys are sorted to match Flask's default JSON provider.'''
+
+    def dumps(self, obj, **kwargs):
+        '''Serialize data as JSON string'''
+
+        return dumps(obj, option=OPT_SORT_KEYS).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        '''Deserialize data from JSON string or bytes'''
+
+        return loads(s)
@@ -1,11 +1,20 @@
+from http.cookiejar import DefaultCookiePolicy
 from logging import getLogger
+from threading import Lock
+from time import monotonic
 from urllib.parse import urlsplit
 
-from requests import get
+from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, Timeout
 
 
 OK = 200
-ALLOWED_SCHEMES = ['http', 'https']
+ALLOWED_SCHEMES = frozenset(('http', 'https'))
+LATEST_CACHE_SIZE = 1024
+POOL_SIZE = 32
+MAX_RETRIES = 3
+TIMEOUT = 30  # in seconds
 
 
 # Exceptions
@@ -19,6 +28,67 @@ class InvalidURL(Exception):
     pass
 
 
+class TTLCache:
+    '''Thread safe cache with expiring entries'''
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = {}
+        self.lock = Lock()
+
+    def get(self, key):
+        '''Returns cached value for the given key or None'''
+
+        with self.lock:
+            if entry := self.entries.get(key):
+                value, expires = entry
+                if expires > monotonic():
+                    return value
+                del self.entries[key]
+
+        return None
+
+    def set(self, key, value, ttl):
+        '''Cache value for the given key for ttl seconds'''
+
+        with self.lock:
+            if len(self.entries) >= self.maxsize:
+                now = monotonic()
+                self.entries = {
+                        cached_key: entry
+                        for cached_key, entry in self.entries.items()
+                        if entry[1] > now}
+                if len(self.entries) >= self.maxsize:
+                    # remove the oldest entry
+                    del self.entries[next(iter(self.entries))]
+            self.entries[key] = (value, monotonic() + ttl)
+
+    def clear(self):
+        '''Remove all cached entries'''
+
+        with self.lock:
+            self.entries.clear()
+
+
+def get_session():
+    '''Returns requests session with a connection pool'''
+
+    session = Session()
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE,
+                          pool_maxsize=POOL_SIZE,
+                          max_retries=MAX_RETRIES)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    # session is shared between users, do not keep cookies
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    return session
+
+
+latest_cache = TTLCache(maxsize=LATEST_CACHE_SIZE)
+session = get_session()
+
+
 def is_valid_url(url, allowed_domains=None, logger=getLogger()):
     '''Checks if provided URL is valid and allowed URL'''
 
@@ -27,7 +97,8 @@ def is_valid_url(url, allowed_domains=None, logger=getLogger()):
         if url_parts.scheme not in ALLOWED_SCHEMES:
             logger.info(f'URL: {url_parts.scheme} scheme is not allowed.')
             raise InvalidURL(f'{url_parts.scheme} scheme is not allowed.')
-        if '.'.join(url_parts.netloc.split('.')[-2:]) not in allowed_domains:
+        domain = '.'.join(url_parts.netloc.rsplit('.', 2)[-2:])
+        if domain not in allowed_domains:
             logger.info(f'URL: {url_parts.netloc} domain is not allowed.')
             raise InvalidURL(f'{url_parts.netloc} domain is not allowed.')
     except ValueError as e:
@@ -37,11 +108,30 @@ def is_valid_url(url, allowed_domains=None, logger=getLogger()):
     return True
 
 
-def get_latest(doc, dt_latest_url, logger=getLogger()):
-    '''Returns URL latest ID/RFC from Datatracker.'''
+def get_datatracker(url, logger=getLogger()):
+    '''Returns datatracker response for the given URL.
+    Raises DocumentNotFound if datatracker is not reachable.'''
+
+    try:
+        return session.get(url, timeout=TIMEOUT)
+    except (ConnectionError, Timeout) as e:
+        logger.error('Connection error on {url}: {error}'.format(
+                                                            url=url,
+                                                            error=e))
+        raise DocumentNotFound('Can not connect to datatracker')
+
+
+def get_latest(doc, dt_latest_url, logger=getLogger(), cache_ttl=None):
+    '''Returns URL latest ID/RFC from Datatracker.
+    Results are cached for cache_ttl seconds if cache_ttl is set.'''
 
     url = '/'.join([dt_latest_url, doc])
-    with get(url) as response:
+
+    if cache_ttl and (latest_doc := latest_cache.get(url)):
+        logger.debug('latest document cache hit: {}'.format(doc))
+        return latest_doc
+
+    with get_datatracker(url, logger) as response:
         if response.status_code == OK:
             try:
                 data = response.json()
@@ -56,13 +146,16 @@ def get_latest(doc, dt_latest_url, logger=getLogger()):
             raise DocumentNotFound(
                     'Can not find the latest document on datatracker')
 
+        if cache_ttl:
+            latest_cache.set(url, latest_doc, cache_ttl)
+
         return latest_doc
 
 
-def get_previous(doc, dt_latest_url, logger=getLogger()):
+def get_previous(doc, dt_latest_url, logger=getLogger(), cache_ttl=None):
     '''Returns previous ID/RFC from datatracker'''
     url = '/'.join([dt_latest_url, doc])
-    with get(url) as response:
+    with get_datatracker(url, logger) as response:
         if response.status_code == OK:
             try:
                 data = response.json()
@@ -77,14 +170,14 @@ def get_previous(doc, dt_latest_url, logger=getLogger()):
             raise DocumentNotFound(
                     'Can not find the previous document on datatracker')
 
-        return get_latest(previous_doc, dt_latest_url, logger)
+        return get_latest(previous_doc, dt_latest_url, logger, cache_ttl)
 
 
 def get_both(doc, dt_latest_url, logger=getLogger()):
     '''Returns urls of given doc  and previous ID/RFC from Datatracker.'''
 
     url = '/'.join([dt_latest_url, doc])
-    with get(url) as response:
+    with get_datatracker(url, logger) as response:
         if response.status_code == OK:
             try:
                 data = response.json()
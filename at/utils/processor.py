@@ -7,6 +7,7 @@ from lxml.etree import XMLSyntaxError
 
 from at.utils.file import get_extension, get_filename, save_file
 from at.utils.logs import get_errors, process_xml2rfc_log
+from at.utils.runner import run_xml2rfc
 
 
 # Exceptions
@@ -38,6 +39,13 @@ def process_file(file, upload_dir, logger=getLogger()):
 
     logger.info('file saved at {}'.format(filename))
 
+    return (dir_path, convert_file(filename, logger))
+
+
+def convert_file(filename, logger=getLogger()):
+    '''Returns XML version of the given saved file.
+    NOTE: if file is an XML file, that file wouldn't go through conversion.'''
+
     file_ext = get_extension(filename)
 
     if file_ext.lower() in ['.md', '.mkd']:
@@ -45,7 +53,7 @@ def process_file(file, upload_dir, logger=getLogger()):
     elif file_ext.lower() == '.txt':
         filename = txt2xml(filename, logger)
 
-    return (dir_path, filename)
+    return filename
 
 
 def md2xml(filename, logger=getLogger()):
@@ -141,11 +149,11 @@ def convert_v2v3(filename, logger=getLogger()):
 
     xml_file = get_filename(filename, 'xml')
 
-    output = proc_run(
+    output = run_xml2rfc(
                 args=[
                     'xml2rfc', '--v2v3', '--out', xml_file,
                     filename],
-                capture_output=True)
+                logger=logger)
 
     try:
         output.check_returncode()
@@ -182,7 +190,7 @@ def get_xml(filename, logger=getLogger()):
             filename, logs = convert_v2v3(filename, logger)
     except (XmlRfcError, XMLSyntaxError) as e:
         logger.info('xml2rfc error: {}'.format(str(e)))
-        raise XML2RFCError(e)
+        raise XML2RFCError(str(e))
 
     logger.info('new file saved at {}'.format(filename))
     return (filename, logs)
@@ -194,11 +202,11 @@ def get_html(filename, logger=getLogger()):
 
     html_file = get_filename(filename, 'html')
 
-    output = proc_run(
+    output = run_xml2rfc(
                 args=[
                     'xml2rfc', '--html', '--out', html_file,
                     filename],
-                capture_output=True)
+                logger=logger)
 
     try:
         output.check_returncode()
@@ -219,11 +227,11 @@ def get_text(filename, logger=getLogger()):
 
     text_file = get_filename(filename, 'txt')
 
-    output = proc_run(
+    output = run_xml2rfc(
                 args=[
                     'xml2rfc', '--text', '--out', text_file,
                     filename],
-                capture_output=True)
+                logger=logger)
 
     try:
         output.check_returncode()
@@ -246,11 +254,11 @@ def get_pdf(filename, logger=getLogger()):
 
     pdf_file = get_filename(filename, 'pdf')
 
-    output = proc_run(
+    output = run_xml2rfc(
                 args=[
                     'xml2rfc', '--pdf', '--out', pdf_file,
                     filename],
-                capture_output=True)
+                logger=logger)
 
     try:
         output.check_returncode()
@@ -0,0 +1,60 @@
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from logging import getLogger
+from subprocess import run as proc_run, CompletedProcess
+import sys
+from traceback import format_exc
+
+import xml2rfc.log
+from xml2rfc.run import main as xml2rfc_main
+
+XML2RFC_IN_PROCESS = False
+
+
+def set_in_process(enabled=True):
+    '''Enable/disable running xml2rfc in the current process.
+    NOTE: Only enable this on processes that run one job at a time,
+    such as Celery prefork worker processes.'''
+
+    global XML2RFC_IN_PROCESS
+    XML2RFC_IN_PROCESS = enabled
+
+
+def run_xml2rfc(args, logger=getLogger()):
+    '''Run xml2rfc with given arguments and returns CompletedProcess'''
+
+    if not XML2RFC_IN_PROCESS:
+        return proc_run(args=args, capture_output=True)
+
+    logger.debug('running xml2rfc in process')
+
+    stdout = StringIO()
+    stderr = StringIO()
+    xml2rfc.log.write_out = stdout
+    xml2rfc.log.write_err = stderr
+    argv = sys.argv
+    sys.argv = args
+    returncode = 0
+
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            xml2rfc_main()
+    except SystemExit as e:
+        if isinstance(e.code, str):
+            stderr.write(e.code + '\n')
+            returncode = 1
+        elif e.code:
+            returncode = e.code
+    except Exception:
+        stderr.write(format_exc())
+        returncode = 1
+    finally:
+        sys.argv = argv
+        xml2rfc.log.write_out = sys.stdout
+        xml2rfc.log.write_err = sys.stderr
+
+    return CompletedProcess(
+            args=args,
+            returncode=returncode,
+            stdout=stdout.getvalue().encode('utf-8'),
+            stderr=stderr.getvalue().encode('utf-8'))
@@ -4,28 +4,31 @@ from subprocess import run as proc_run, CalledProcessError
 from xml2rfc import XmlRfcParser
 from lxml.etree import XMLSyntaxError
 
-from at.utils.file import cleanup_output, get_extension, get_filename
+from at.utils.file import (
+        cleanup_output, get_extension, get_filename, save_file)
 from at.utils.logs import process_xml2rfc_log
-from at.utils.processor import process_file, XML2RFCError
-from at.utils.text import get_text_id_from_file
+from at.utils.processor import convert_file, XML2RFCError
+from at.utils.runner import run_xml2rfc
 
 
 def validate_draft(file, upload_dir, logger=getLogger()):
     '''Validate uploaded file.'''
 
-    file_ext = get_extension(file.filename)
+    _, filename = save_file(file, upload_dir)
+
+    return validate_file(filename, logger=logger)
+
+
+def validate_file(filename, logger=getLogger()):
+    '''Validate saved file.'''
+
+    file_ext = get_extension(filename)
 
     if file_ext.lower() == '.txt':
         # don't try to convert text files to XML
-        _, filename = get_text_id_from_file(
-                        file=file,
-                        upload_dir=upload_dir)
         log = {'idnits': idnits(filename, logger)}
     else:
-        _, filename = process_file(
-                        file=file,
-                        upload_dir=upload_dir,
-                        logger=logger)
+        filename = convert_file(filename, logger=logger)
         log = validate_xml(filename, logger=logger)
 
     # get list of non ASCII chars
@@ -55,7 +58,7 @@ def validate_xml(filename, logger=getLogger()):
 
     except XMLSyntaxError as e:
         logger.info('xml2rfc error: {}'.format(str(e)))
-        raise XML2RFCError(e)
+        raise XML2RFCError(str(e))
 
     logger.info('new file saved at {}'.format(filename))
 
@@ -80,10 +83,10 @@ def xml2rfc_validation(filename, logger=getLogger()):
 
     text_file = get_filename(filename, 'txt')
 
-    output = proc_run(
+    output = run_xml2rfc(
                 args=['xml2rfc', '--warn-bare-unicode', '--out', text_file,
                       filename],
-                capture_output=True)
+                logger=logger)
 
     try:
         output.check_returncode()
@@ -103,9 +106,9 @@ def convert_v2v3(filename, logger=getLogger()):
 
     xml_file = get_filename(filename, 'xml')
 
-    output = proc_run(
+    output = run_xml2rfc(
                 args=['xml2rfc', '--v2v3', '--out', xml_file, filename],
-                capture_output=True)
+                logger=logger)
 
     try:
         output.check_returncode()
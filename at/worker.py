@@ -0,0 +1,13 @@
+from celery.signals import worker_process_init
+
+from at import create_app
+from at.utils.runner import set_in_process
+
+app = create_app()
+celery = app.extensions['celery']
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    '''Run xml2rfc within the warm worker processes'''
+    set_in_process()
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from logging import getLogger
 from subprocess import run as proc_run, CalledProcessError
 
@@ -149,17 +150,30 @@ def get_rfcdiff_version(logger=getLogger()):
 
 
 if __name__ == '__main__':
+    # version probes wait on subprocesses, so run them in parallel
+    with ThreadPoolExecutor(max_workers=9) as executor:
+        probes = {
+            'kramdown-rfc': executor.submit(get_kramdown_rfc_version),
+            'mmark': executor.submit(get_mmark_version),
+            'id2xml': executor.submit(get_id2xml_version),
+            'idnits': executor.submit(get_idnits_version),
+            'idnits3': executor.submit(get_idnits3_version),
+            'iddiff': executor.submit(get_iddiff_version),
+            'aasvg': executor.submit(get_aasvg_version),
+            'svgcheck': executor.submit(get_svgcheck_version),
+            'rfcdiff': executor.submit(get_rfcdiff_version)}
+
     VERSION_INFORMATION = {
         'xml2rfc': get_xml2rfc_version(),
-        'kramdown-rfc': get_kramdown_rfc_version(),
-        'mmark': get_mmark_version(),
-        'id2xml': get_id2xml_version(),
+        'kramdown-rfc': probes['kramdown-rfc'].result(),
+        'mmark': probes['mmark'].result(),
+        'id2xml': probes['id2xml'].result(),
         'weasyprint': get_weasyprint_version(),
-        'idnits': get_idnits_version(),
-        'idnits3': get_idnits3_version(),
-        'iddiff': get_iddiff_version(),
-        'aasvg': get_aasvg_version(),
-        'svgcheck': get_svgcheck_version(),
-        'rfcdiff': get_rfcdiff_version(),
+        'idnits': probes['idnits'].result(),
+        'idnits3': probes['idnits3'].result(),
+        'iddiff': probes['iddiff'].result(),
+        'aasvg': probes['aasvg'].result(),
+        'svgcheck': probes['svgcheck'].result(),
+        'rfcdiff': probes['rfcdiff'].result(),
         'bap': '1.4'}   # bap does not provide a switch to get version
     print(f'VERSION_INFORMATION = {VERSION_INFORMATION}')
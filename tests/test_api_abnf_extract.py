@@ -1,14 +1,11 @@
 from logging import disable as set_logger, INFO, CRITICAL
+from tempfile import TemporaryDirectory
 from unittest import TestCase
-from os.path import abspath
-from pathlib import Path
-from shutil import rmtree
 from urllib.parse import urlencode
 
 from at import create_app
 
 API = '/api/abnf/extract'
-TEMPORARY_DATA_DIR = './tests/tmp/'
 DT_LATEST_DRAFT_URL = 'https://datatracker.ietf.org/api/rfcdiff-latest-json'
 ALLOWED_DOMAINS = ['ietf.org', 'rfc-editor.org']
 
@@ -20,10 +17,10 @@ class TestApiAbnfExtract(TestCase):
         # susspress logging messages
         set_logger(CRITICAL)
         # create temporary data dir
-        Path(TEMPORARY_DATA_DIR).mkdir(exist_ok=True)
+        self.temporary_data_dir = TemporaryDirectory()
 
         config = {
-                'UPLOAD_DIR': abspath(TEMPORARY_DATA_DIR),
+                'UPLOAD_DIR': self.temporary_data_dir.name,
                 'REQUIRE_AUTH': False,
                 'DT_LATEST_DRAFT_URL': DT_LATEST_DRAFT_URL,
                 'ALLOWED_DOMAINS': ALLOWED_DOMAINS}
@@ -34,7 +31,7 @@ class TestApiAbnfExtract(TestCase):
         # set logging to INFO
         set_logger(INFO)
         # remove temporary data dir
-        rmtree(TEMPORARY_DATA_DIR, ignore_errors=True)
+        self.temporary_data_dir.cleanup()
 
     def test_no_input(self):
         with self.app.test_client() as client:
@@ -1,13 +1,10 @@
 from logging import disable as set_logger, INFO, CRITICAL
+from tempfile import TemporaryDirectory
 from unittest import TestCase
-from os.path import abspath
-from pathlib import Path
-from shutil import rmtree
 
 from at import create_app
 
 API = '/api/abnf/parse'
-TEMPORARY_DATA_DIR = './tests/tmp/'
 DT_LATEST_DRAFT_URL = 'https://datatracker.ietf.org/doc/rfcdiff-latest-json'
 ALLOWED_DOMAINS = ['ietf.org', 'rfc-editor.org']
 TEST_DATA_DIR = './tests/data/'
@@ -22,10 +19,10 @@ class TestApiAbnfParse(TestCase):
         # susspress logging messages
         set_logger(CRITICAL)
         # create temporary data dir
-        Path(TEMPORARY_DATA_DIR).mkdir(exist_ok=True)
+        self.temporary_data_dir = TemporaryDirectory()
 
         config = {
-                'UPLOAD_DIR': abspath(TEMPORARY_DATA_DIR),
+                'UPLOAD_DIR': self.temporary_data_dir.name,
                 'REQUIRE_AUTH': False,
                 'DT_LATEST_DRAFT_URL': DT_LATEST_DRAFT_URL,
                 'ALLOWED_DOMAINS': ALLOWED_DOMAINS}
@@ -36,7 +33,7 @@ class TestApiAbnfParse(TestCase):
         # set logging to INFO
         set_logger(INFO)
         # remove temporary data dir
-        rmtree(TEMPORARY_DATA_DIR, ignore_errors=True)
+        self.temporary_data_dir.cleanup()
 
     def test_abnf_parse(self):
         with self.app.test_client() as client:
@@ -1,7 +1,6 @@
 from logging import disable as set_logger, INFO, CRITICAL
-from os.path import abspath
-from pathlib import Path
-from shutil import rmtree
+from os.path import join
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 
 from at import create_app
@@ -9,14 +8,13 @@ from at import create_app
 TEST_DATA_DIR = './tests/data/'
 TEST_XML_DRAFT = 'draft-smoke-signals-02.xml'
 TEST_UNSUPPORTED_FORMAT = 'draft-smoke-signals-00.odt'
-TEMPORARY_DATA_DIR = './tests/tmp/'
 VALID_API_KEY = 'foobar'
 SITE_URL = 'https://example.org'
 
 
 def get_path(filename):
     '''Returns file path'''
-    return ''.join([TEST_DATA_DIR, filename])
+    return join(TEST_DATA_DIR, filename)
 
 
 class TestApiCleanSvgIds(TestCase):
@@ -26,10 +24,10 @@ class TestApiCleanSvgIds(TestCase):
         # susspress logging messages
         set_logger(CRITICAL)
         # create temporary data dir
-        Path(TEMPORARY_DATA_DIR).mkdir(exist_ok=True)
+        self.temporary_data_dir = TemporaryDirectory()
 
         config = {
-                'UPLOAD_DIR': abspath(TEMPORARY_DATA_DIR),
+                'UPLOAD_DIR': self.temporary_data_dir.name,
                 'REQUIRE_AUTH': False,
                 'SITE_URL': SITE_URL}
 
@@ -39,7 +37,7 @@ class TestApiCleanSvgIds(TestCase):
         # set logging to INFO
         set_logger(INFO)
         # remove temporary data dir
-        rmtree(TEMPORARY_DATA_DIR, ignore_errors=True)
+        self.temporary_data_dir.cleanup()
 
     def test_no_file(self):
         with self.app.test_client() as client:
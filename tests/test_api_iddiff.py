@@ -1,7 +1,6 @@
 from logging import disable as set_logger, INFO, CRITICAL
-from os.path import abspath
-from pathlib import Path
-from shutil import rmtree
+from os.path import join
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 from urllib.parse import urlencode
 
@@ -17,7 +16,6 @@ XML_DRAFT_A = 'draft-smoke-signals-00.xml'
 XML_DRAFT_B = 'draft-smoke-signals-01.xml'
 TEST_UNSUPPORTED_FORMAT = 'draft-smoke-signals-00.odt'
 TEST_XML_ERROR = 'draft-smoke-signals-00.error.xml'
-TEMPORARY_DATA_DIR = './tests/tmp/'
 DT_LATEST_DRAFT_URL = 'https://datatracker.ietf.org/api/rfcdiff-latest-json'
 VALID_API_KEY = 'foobar'
 ALLOWED_DOMAINS = ['ietf.org', 'rfc-editor.org',]
@@ -25,7 +23,7 @@ ALLOWED_DOMAINS = ['ietf.org', 'rfc-editor.org',]
 
 def get_path(filename):
     '''Returns file path'''
-    return ''.join([TEST_DATA_DIR, filename])
+    return join(TEST_DATA_DIR, filename)
 
 
 class TestApiIddiff(TestCase):
@@ -35,10 +33,10 @@ class TestApiIddiff(TestCase):
         # susspress logging messages
         set_logger(CRITICAL)
         # create temporary data dir
-        Path(TEMPORARY_DATA_DIR).mkdir(exist_ok=True)
+        self.temporary_data_dir = TemporaryDirectory()
 
         config = {
-                'UPLOAD_DIR': abspath(TEMPORARY_DATA_DIR),
+                'UPLOAD_DIR': self.temporary_data_dir.name,
                 'REQUIRE_AUTH': False,
                 'DT_LATEST_DRAFT_URL': DT_LATEST_DRAFT_URL,
                 'ALLOWED_DOMAINS': ALLOWED_DOMAINS}
@@ -49,7 +47,7 @@ class TestApiIddiff(TestCase):
         # set logging to INFO
         set_logger(INFO)
         # remove temporary data dir
-        rmtree(TEMPORARY_DATA_DIR, ignore_errors=True)
+        self.temporary_data_dir.cleanup()
 
     def test_no_file(self):
         with self.app.test_client() as client:
@@ -1,7 +1,6 @@
 from logging import disable as set_logger, INFO, CRITICAL
-from os.path import abspath
-from pathlib import Path
-from shutil import rmtree
+from os.path import join
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 from urllib.parse import urlencode
 
@@ -12,13 +11,12 @@ TEST_XML_DRAFT = 'draft-smoke-signals-00.xml'
 TEST_UNSUPPORTED_FORMAT = 'draft-smoke-signals-00.odt'
 TEST_XML_ERROR = 'draft-smoke-signals-00.error.xml'
 TEST_KRAMDOWN_ERROR = 'draft-smoke-signals-00.error.md'
-TEMPORARY_DATA_DIR = './tests/tmp/'
 ALLOWED_DOMAINS = ['ietf.org', 'datatracker.ietf.org']
 
 
 def get_path(filename):
     '''Returns file path'''
-    return ''.join([TEST_DATA_DIR, filename])
+    return join(TEST_DATA_DIR, filename)
 
 
 class TestApiIdnits(TestCase):
@@ -28,10 +26,10 @@ class TestApiIdnits(TestCase):
         # susspress logging messages
         set_logger(CRITICAL)
         # create temporary data dir
-        Path(TEMPORARY_DATA_DIR).mkdir(exist_ok=True)
+        self.temporary_data_dir = TemporaryDirectory()
 
         config = {
-                'UPLOAD_DIR': abspath(TEMPORARY_DATA_DIR),
+                'UPLOAD_DIR': self.temporary_data_dir.name,
                 'REQUIRE_AUTH': False,
                 'ALLOWED_DOMAINS': ALLOWED_DOMAINS}
 
@@ -41,7 +39,7 @@ class TestApiIdnits(TestCase):
         # set logging to INFO
         set_logger(INFO)
         # remove temporary data dir
-        rmtree(TEMPORARY_DATA_DIR, ignore_errors=True)
+        self.temporary_data_dir.cleanup()
 
     def test_no_url(self):
         with self.app.test_client() as client:
@@ -226,3 +224,17 @@ class TestApiIdnits(TestCase):
 
                 self.assertEqual(result.status_code, 400)
                 self.assertIsNotNone(json_data['error'])
+
+    def test_xml_error_stream(self):
+        with self.app.test_client() as client:
+            with self.app.app_context():
+                with open(get_path(TEST_XML_ERROR), 'rb') as file:
+                    result = client.post(
+                            '/api/idnits',
+                            query_string={'filename': TEST_XML_ERROR},
+                            data=file.read(),
+                            content_type='application/octet-stream')
+                json_data = result.get_json()
+
+                self.assertEqual(result.status_code, 400)
+                self.assertIn(TEST_XML_ERROR, json_data['error'])
@@ -1,7 +1,6 @@
 from logging import disable as set_logger, INFO, CRITICAL
-from os.path import abspath
-from pathlib import Path
-from shutil import rmtree
+from os.path import join
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 from urllib.parse import urlencode
 
@@ -15,13 +14,12 @@ TEST_UNSUPPORTED_FORMAT = 'draft-smoke-signals-00.odt'
 TEST_XML_ERROR = 'draft-smoke-signals-00.error.xml'
 TEST_TEXT_ERROR = 'draft-smoke-signals-00.error.txt'
 TEST_KRAMDOWN_ERROR = 'draft-smoke-signals-00.error.md'
-TEMPORARY_DATA_DIR = './tests/tmp/'
 ALLOWED_DOMAINS = ['ietf.org', 'datatracker.ietf.org']
 
 
 def get_path(filename):
     '''Returns file path'''
-    return ''.join([TEST_DATA_DIR, filename])
+    return join(TEST_DATA_DIR, filename)
 
 
 class TestApiidnits3(TestCase):
@@ -31,10 +29,10 @@ class TestApiidnits3(TestCase):
         # susspress logging messages
         set_logger(CRITICAL)
         # create temporary data dir
-        Path(TEMPORARY_DATA_DIR).mkdir(exist_ok=True)
+        self.temporary_data_dir = TemporaryDirectory()
 
         config = {
-                'UPLOAD_DIR': abspath(TEMPORARY_DATA_DIR),
+                'UPLOAD_DIR': self.temporary_data_dir.name,
                 'REQUIRE_AUTH': False,
                 'ALLOWED_DOMAINS': ALLOWED_DOMAINS}
 
@@ -44,7 +42,7 @@ class TestApiidnits3(TestCase):
         # set logging to INFO
         set_logger(INFO)
         # remove temporary data dir
-        rmtree(TEMPORARY_DATA_DIR, ignore_errors=True)
+        self.temporary_data_dir.cleanup()
 
     def test_no_url(self):
         with self.app.test_client() as client:
@@ -235,3 +233,20 @@ class TestApiidnits3(TestCase):
                 self.assertIn(TEST_TEXT_ERROR, data)
                 self.assertIn('idnits', data)
                 self.assertNotIn('Document is VALID.', data)
+
+    def test_text_error_stream(self):
+        with self.app.test_client() as client:
+            with self.app.app_context():
+                with open(get_path(TEST_TEXT_ERROR), 'rb') as file:
+                    result = client.post(
+                            '/api/idnits3',
+                            query_string={'filename': TEST_TEXT_ERROR,
+                                          'submission': True},
+                            data=file.read(),
+                            content_type='application/octet-stream')
+                data = result.get_data(as_text=True)
+
+                self.assertEqual(result.status_code, 200)
+                self.assertIn(TEST_TEXT_ERROR, data)
+                self.assertIn('idnits', data)
+                self.assertNotIn('Document is VALID.', data)
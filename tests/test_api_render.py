@@ -1,8 +1,10 @@
-from logging import disable as set_logger, INFO, CRITICAL
-from os.path import abspath
+from logging import disable as set_logger, INFO, CRITICAL, NOTSET
+from os import environ
+from os.path import join
 from pathlib import Path
-from shutil import rmtree
+from tempfile import TemporaryDirectory
 from unittest import TestCase
+from unittest.mock import patch
 
 from at import create_app
 
@@ -19,14 +21,13 @@ TEST_KRAMDOWN_ERROR = 'draft-smoke-signals-00.error.md'
 TEST_DATA = [
         TEST_XML_DRAFT, TEST_XML_V2_DRAFT, TEST_TEXT_DRAFT,
         TEST_KRAMDOWN_DRAFT, TEST_MMARK_DRAFT]
-TEMPORARY_DATA_DIR = './tests/tmp/'
 VALID_API_KEY = 'foobar'
 SITE_URL = 'https://example.org'
 
 
 def get_path(filename):
     '''Returns file path'''
-    return ''.join([TEST_DATA_DIR, filename])
+    return join(TEST_DATA_DIR, filename)
 
 
 class TestApiRender(TestCase):
@@ -36,10 +37,10 @@ class TestApiRender(TestCase):
         # susspress logging messages
         set_logger(CRITICAL)
         # create temporary data dir
-        Path(TEMPORARY_DATA_DIR).mkdir(exist_ok=True)
+        self.temporary_data_dir = TemporaryDirectory()
 
         config = {
-                'UPLOAD_DIR': abspath(TEMPORARY_DATA_DIR),
+                'UPLOAD_DIR': self.temporary_data_dir.name,
                 'REQUIRE_AUTH': False,
                 'SITE_URL': SITE_URL}
 
@@ -49,7 +50,7 @@ class TestApiRender(TestCase):
         # set logging to INFO
         set_logger(INFO)
         # remove temporary data dir
-        rmtree(TEMPORARY_DATA_DIR, ignore_errors=True)
+        self.temporary_data_dir.cleanup()
 
     def test_no_file(self):
         with self.app.test_client() as client:
@@ -77,6 +78,59 @@ class TestApiRender(TestCase):
                 self.assertEqual(result.status_code, 400)
                 self.assertEqual(json_data['error'], 'Filename is missing')
 
+    def test_stream_missing_file_name(self):
+        with self.app.test_client() as client:
+            with self.app.app_context():
+                with open(get_path(TEST_XML_DRAFT), 'rb') as file:
+                    result = client.post(
+                            '/api/render/xml',
+                            data=file.read(),
+                            content_type='application/octet-stream')
+                json_data = result.get_json()
+
+                self.assertEqual(result.status_code, 400)
+                self.assertEqual(json_data['error'], 'Filename is missing')
+
+    def test_stream_unsupported_file_format(self):
+        with self.app.test_client() as client:
+            with self.app.app_context():
+                with open(get_path(TEST_UNSUPPORTED_FORMAT), 'rb') as file:
+                    result = client.post(
+                            '/api/render/xml',
+                            query_string={
+                                'filename': TEST_UNSUPPORTED_FORMAT},
+                            data=file.read(),
+                            content_type='application/octet-stream')
+                json_data = result.get_json()
+
+                self.assertEqual(result.status_code, 400)
+                self.assertEqual(
+                        json_data['error'],
+                        'Input file format not supported')
+
+    def test_request_too_large(self):
+        self.app.config['MAX_CONTENT_LENGTH'] = 1024
+
+        with self.app.test_client() as client:
+            with self.app.app_context():
+                for content_type in ('application/octet-stream',
+                                     'multipart/form-data'):
+                    with open(get_path(TEST_XML_DRAFT), 'rb') as file:
+                        if content_type == 'multipart/form-data':
+                            data = {'file': (file, TEST_XML_DRAFT)}
+                        else:
+                            data = file.read()
+                        result = client.post(
+                                '/api/render/xml',
+                                query_string={'filename': TEST_XML_DRAFT},
+                                data=data,
+                                content_type=content_type)
+                    json_data = result.get_json()
+
+                    self.assertEqual(result.status_code, 413)
+                    self.assertEqual(
+                            json_data['error'], 'Input file is too large')
+
     def test_unsupported_render_format(self):
         with self.app.test_client() as client:
             with self.app.app_context():
@@ -134,6 +188,46 @@ class TestApiRender(TestCase):
                     self.assertEqual(export.status_code, 200)
                     self.assertIsNotNone(export.data)
 
+    def test_render_xml_stream(self):
+        with self.app.test_client() as client:
+            with self.app.app_context():
+                for filename in TEST_DATA:
+                    with open(get_path(filename), 'rb') as file:
+                        result = client.post(
+                                '/api/render/xml',
+                                query_string={'filename': filename},
+                                data=file.read(),
+                                content_type='application/octet-stream')
+                    json_data = result.get_json()
+
+                    self.assertEqual(result.status_code, 200)
+                    self.assertTrue(json_data['url'].startswith(
+                                                    '{}/'.format(SITE_URL)))
+                    self.assertIn('errors', json_data['logs'].keys())
+                    self.assertIn('warnings', json_data['logs'].keys())
+
+    def test_render_cache(self):
+        self.app.config['CACHE_DIR'] = join(
+                self.temporary_data_dir.name, 'cache')
+
+        with self.app.test_client() as client:
+            with self.app.app_context():
+                urls = []
+                for _ in range(2):
+                    result = client.post(
+                            '/api/render/xml',
+                            data={
+                                'file': (
+                                    open(get_path(TEST_XML_DRAFT), 'rb'),
+                                    TEST_XML_DRAFT),
+                                'apikey': VALID_API_KEY})
+                    json_data = result.get_json()
+
+                    self.assertEqual(result.status_code, 200)
+                    urls.append(json_data['url'])
+
+                self.assertEqual(urls[0], urls[1])
+
     def test_render_text(self):
         with self.app.test_client() as client:
             with self.app.app_context():
@@ -253,6 +347,56 @@ class TestApiRender(TestCase):
                 self.assertTrue(json_data['error'].startswith(
                     'xml2rfc error:'))
 
+    def test_xml_error_logging(self):
+        # processor errors are expected task failures
+        set_logger(NOTSET)
+
+        with self.app.test_client() as client:
+            with self.app.app_context():
+                with self.assertNoLogs('celery.app.trace', level='ERROR'):
+                    result = client.post(
+                            '/api/render/xml',
+                            data={
+                                'file': (
+                                    open(get_path(TEST_XML_ERROR), 'rb'),
+                                    TEST_XML_ERROR),
+                                'apikey': VALID_API_KEY})
+
+                self.assertEqual(result.status_code, 400)
+
+    def test_export_x_accel_redirect(self):
+        self.app.config['USE_X_SENDFILE'] = True
+        self.app.config['X_ACCEL_REDIRECT'] = '/_export'
+        export_dir = Path(self.temporary_data_dir.name, 'foo')
+        export_dir.mkdir()
+        Path(export_dir, 'bar.xml').write_text('<rfc/>')
+
+        with self.app.test_client() as client:
+            with self.app.app_context():
+                result = client.get('/api/export/foo/bar.xml')
+
+                self.assertEqual(result.status_code, 200)
+                self.assertEqual(result.headers['X-Accel-Redirect'],
+                                 '/_export/foo/bar.xml')
+                self.assertNotIn('X-Sendfile', result.headers)
+                self.assertIsNotNone(result.headers['ETag'])
+                self.assertEqual(result.data, b'')
+
+    def test_use_x_sendfile_env(self):
+        config = {
+                'UPLOAD_DIR': self.temporary_data_dir.name,
+                'REQUIRE_AUTH': False,
+                'SITE_URL': SITE_URL}
+
+        for value in ('1', 'true', 'Yes'):
+            with patch.dict(environ, {'USE_X_SENDFILE': value}):
+                self.assertTrue(create_app(config).config['USE_X_SENDFILE'])
+
+        for value in ('0', 'false', 'no', ''):
+            with patch.dict(environ, {'USE_X_SENDFILE': value}):
+                self.assertFalse(
+                        create_app(config).config.get('USE_X_SENDFILE'))
+
     def test_export_error(self):
         with self.app.test_client() as client:
             with self.app.app_context():
@@ -0,0 +1,207 @@
+from logging import disable as set_logger, INFO, CRITICAL
+from os.path import join
+from shutil import copy
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from celery.exceptions import ImproperlyConfigured
+
+from at import create_app
+from at.tasks import render_task
+from at.utils.cache import get_pending
+from at.utils.processor import KramdownError
+
+TEST_DATA_DIR = './tests/data/'
+TEST_XML_DRAFT = 'draft-smoke-signals-00.xml'
+TEST_XML_ERROR = 'draft-smoke-signals-00.error.xml'
+VALID_API_KEY = 'foobar'
+SITE_URL = 'https://example.org'
+CELERY_BROKER_URL = 'memory://'
+CELERY_RESULT_BACKEND = 'cache+memory://'
+
+
+def get_path(filename):
+    '''Returns file path'''
+    return join(TEST_DATA_DIR, filename)
+
+
+class TestApiStatus(TestCase):
+    '''Tests for /api/status end point'''
+
+    def setUp(self):
+        # susspress logging messages
+        set_logger(CRITICAL)
+        # create temporary data dir
+        self.temporary_data_dir = TemporaryDirectory()
+
+        self.config = {
+                'UPLOAD_DIR': self.temporary_data_dir.name,
+                'REQUIRE_AUTH': False,
+                'SITE_URL': SITE_URL}
+
+    def tearDown(self):
+        # set logging to INFO
+        set_logger(INFO)
+        # remove temporary data dir
+        self.temporary_data_dir.cleanup()
+
+    def test_task_queue_disabled(self):
+        app = create_app(self.config)
+
+        with app.test_client() as client:
+            with app.app_context():
+                result = client.get('/api/status/foobar')
+                json_data = result.get_json()
+
+                self.assertEqual(result.status_code, 404)
+                self.assertEqual(json_data['error'], 'Task not found')
+
+    def test_result_backend_required(self):
+        config = self.config.copy()
+        config['CELERY_BROKER_URL'] = CELERY_BROKER_URL
+
+        with self.assertRaises(ImproperlyConfigured):
+            create_app(config)
+
+    def test_queued_render(self):
+        config = self.config.copy()
+        config['CELERY_BROKER_URL'] = CELERY_BROKER_URL
+        config['CELERY_RESULT_BACKEND'] = CELERY_RESULT_BACKEND
+        app = create_app(config)
+
+        with app.test_client() as client:
+            with app.app_context():
+                result = client.post(
+                        '/api/render/xml',
+                        data={
+                            'file': (
+                                open(get_path(TEST_XML_DRAFT), 'rb'),
+                                TEST_XML_DRAFT),
+                            'apikey': VALID_API_KEY})
+                json_data = result.get_json()
+
+                self.assertEqual(result.status_code, 202)
+                self.assertEqual(json_data['state'], 'PENDING')
+                self.assertEqual(
+                        json_data['url'],
+                        '/'.join((SITE_URL, 'api', 'status',
+                                  json_data['task_id'])))
+
+                # test status
+                status_url = json_data['url'].replace(SITE_URL, '')
+                status = client.get(status_url)
+                json_data = status.get_json()
+
+                self.assertEqual(status.status_code, 202)
+                self.assertEqual(json_data['state'], 'PENDING')
+
+    def test_queued_render_shared(self):
+        config = self.config.copy()
+        config['CELERY_BROKER_URL'] = CELERY_BROKER_URL
+        config['CELERY_RESULT_BACKEND'] = CELERY_RESULT_BACKEND
+        config['CACHE_DIR'] = join(self.temporary_data_dir.name, 'cache')
+        app = create_app(config)
+
+        with app.test_client() as client:
+            with app.app_context():
+                task_ids = []
+                for _ in range(2):
+                    result = client.post(
+                            '/api/render/pdf',
+                            data={
+                                'file': (
+                                    open(get_path(TEST_XML_DRAFT), 'rb'),
+                                    TEST_XML_DRAFT),
+                                'apikey': VALID_API_KEY})
+                    json_data = result.get_json()
+
+                    self.assertEqual(result.status_code, 202)
+                    task_ids.append(json_data['task_id'])
+
+                self.assertEqual(task_ids[0], task_ids[1])
+
+    def test_queued_render_error(self):
+        config = self.config.copy()
+        config['CELERY_BROKER_URL'] = CELERY_BROKER_URL
+        config['CELERY_RESULT_BACKEND'] = CELERY_RESULT_BACKEND
+        config['CACHE_DIR'] = join(self.temporary_data_dir.name, 'cache')
+        app = create_app(config)
+
+        with app.test_client() as client:
+            with app.app_context():
+                for side_effect, status_code in (
+                        (ConnectionError('foobar'), 500),
+                        (None, 202)):
+                    with patch.object(render_task, 'apply_async',
+                                      wraps=render_task.apply_async,
+                                      side_effect=side_effect) as apply_async:
+                        result = client.post(
+                                '/api/render/pdf',
+                                data={
+                                    'file': (
+                                        open(get_path(TEST_XML_DRAFT), 'rb'),
+                                        TEST_XML_DRAFT),
+                                    'apikey': VALID_API_KEY})
+
+                    self.assertEqual(result.status_code, status_code)
+                    # task that failed to queue is not shared
+                    self.assertTrue(apply_async.called)
+
+    def test_failed_task_pending(self):
+        config = self.config.copy()
+        config['CACHE_DIR'] = join(self.temporary_data_dir.name, 'cache')
+        app = create_app(config)
+        filename = join(self.temporary_data_dir.name, TEST_XML_ERROR)
+        copy(get_path(TEST_XML_ERROR), filename)
+
+        with app.app_context():
+            get_pending('foobar', 'foo', config['CACHE_DIR'])
+            result = render_task.apply(
+                    (filename, 'xml', 'foobar'),
+                    task_id='foo')
+
+            self.assertTrue(result.failed())
+            self.assertEqual(
+                    get_pending('foobar', 'bar', config['CACHE_DIR']),
+                    'bar')
+
+    def test_completed_task(self):
+        config = self.config.copy()
+        config['CELERY_BROKER_URL'] = CELERY_BROKER_URL
+        config['CELERY_RESULT_BACKEND'] = CELERY_RESULT_BACKEND
+        app = create_app(config)
+        backend = app.extensions['celery'].backend
+        backend.mark_as_done('foo', {'url': 'foobar'})
+        backend.mark_as_done('bar', 'foobar')
+
+        with app.test_client() as client:
+            with app.app_context():
+                result = client.get('/api/status/foo')
+                json_data = result.get_json()
+
+                self.assertEqual(result.status_code, 200)
+                self.assertEqual(json_data['url'], 'foobar')
+
+                result = client.get('/api/status/bar')
+
+                self.assertEqual(result.status_code, 200)
+                self.assertEqual(result.get_data(as_text=True), 'foobar')
+                self.assertTrue(result.headers['ETag'])
+
+    def test_failed_task(self):
+        config = self.config.copy()
+        config['CELERY_BROKER_URL'] = CELERY_BROKER_URL
+        config['CELERY_RESULT_BACKEND'] = CELERY_RESULT_BACKEND
+        app = create_app(config)
+        app.extensions['celery'].backend.mark_as_failure(
+                'foobar', KramdownError('foobar'))
+
+        with app.test_client() as client:
+            with app.app_context():
+                result = client.get('/api/status/foobar')
+                json_data = result.get_json()
+
+                self.assertEqual(result.status_code, 400)
+                self.assertEqual(json_data['error'],
+                                 'kramdown-rfc error: foobar')
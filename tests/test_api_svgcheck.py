@@ -1,13 +1,11 @@
 from logging import disable as set_logger, INFO, CRITICAL
+from tempfile import TemporaryDirectory
 from unittest import TestCase
-from os.path import abspath
-from pathlib import Path
-from shutil import rmtree
+from os.path import join
 
 from at import create_app
 
 API = '/api/svgcheck'
-TEMPORARY_DATA_DIR = './tests/tmp/'
 TEST_DATA_DIR = './tests/data/'
 TEST_SVG = 'ietf.svg'
 TEST_INVALID_SVG = 'invalid.svg'
@@ -16,7 +14,7 @@ TEST_UNSUPPORTED_FORMAT = 'draft-smoke-signals-00.md'
 
 def get_path(filename):
     '''Returns file path'''
-    return ''.join([TEST_DATA_DIR, filename])
+    return join(TEST_DATA_DIR, filename)
 
 
 class TestApiSvgcheck(TestCase):
@@ -26,10 +24,10 @@ class TestApiSvgcheck(TestCase):
         # susspress logging messages
         set_logger(CRITICAL)
         # create temporary data dir
-        Path(TEMPORARY_DATA_DIR).mkdir(exist_ok=True)
+        self.temporary_data_dir = TemporaryDirectory()
 
         config = {
-                'UPLOAD_DIR': abspath(TEMPORARY_DATA_DIR),
+                'UPLOAD_DIR': self.temporary_data_dir.name,
                 'REQUIRE_AUTH': False}
 
         self.app = create_app(config)
@@ -38,7 +36,7 @@ class TestApiSvgcheck(TestCase):
         # set logging to INFO
         set_logger(INFO)
         # remove temporary data dir
-        rmtree(TEMPORARY_DATA_DIR, ignore_errors=True)
+        self.temporary_data_dir.cleanup()
 
     def test_no_file(self):
         with self.app.test_client() as client:
@@ -1,7 +1,6 @@
 from logging import disable as set_logger, INFO, CRITICAL
-from os.path import abspath
-from pathlib import Path
-from shutil import rmtree
+from os.path import join
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 
 from at import create_app
@@ -19,13 +18,12 @@ TEST_KRAMDOWN_ERROR = 'draft-smoke-signals-00.error.md'
 TEST_DATA = [
         TEST_XML_DRAFT, TEST_XML_V2_DRAFT, TEST_KRAMDOWN_DRAFT,
         TEST_MMARK_DRAFT]
-TEMPORARY_DATA_DIR = './tests/tmp/'
 VALID_API_KEY = 'foobar'
 
 
 def get_path(filename):
     '''Returns file path'''
-    return ''.join([TEST_DATA_DIR, filename])
+    return join(TEST_DATA_DIR, filename)
 
 
 class TestApiValidate(TestCase):
@@ -35,10 +33,10 @@ class TestApiValidate(TestCase):
         # susspress logging messages
         set_logger(CRITICAL)
         # create temporary data dir
-        Path(TEMPORARY_DATA_DIR).mkdir(exist_ok=True)
+        self.temporary_data_dir = TemporaryDirectory()
 
         config = {
-                'UPLOAD_DIR': abspath(TEMPORARY_DATA_DIR),
+                'UPLOAD_DIR': self.temporary_data_dir.name,
                 'REQUIRE_AUTH': False}
 
         self.app = create_app(config)
@@ -47,7 +45,7 @@ class TestApiValidate(TestCase):
         # set logging to INFO
         set_logger(INFO)
         # remove temporary data dir
-        rmtree(TEMPORARY_DATA_DIR, ignore_errors=True)
+        self.temporary_data_dir.cleanup()
 
     def test_no_file(self):
         with self.app.test_client() as client:
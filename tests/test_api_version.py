@@ -65,3 +65,23 @@ class TestApiVersion(TestCase):
                 self.assertEqual(
                         json_data['versions']['author_tools_api'],
                         AUTHOR_TOOLS_API_TEST_VERSION)
+
+    def test_version_etag(self):
+        with self.app.test_client() as client:
+            with self.app.app_context():
+                result = client.get('/api/version')
+                etag = result.headers['ETag']
+
+                self.assertEqual(result.status_code, 200)
+                self.assertIsNotNone(etag)
+
+                result = client.get('/api/version',
+                                    headers={'If-None-Match': etag})
+
+                self.assertEqual(result.status_code, 304)
+                self.assertEqual(result.data, b'')
+
+                result = client.get('/api/version',
+                                    headers={'If-None-Match': '"foobar"'})
+
+                self.assertEqual(result.status_code, 200)
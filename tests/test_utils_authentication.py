@@ -1,11 +1,12 @@
 from logging import disable as set_logger, INFO, CRITICAL
-from os.path import abspath
+from os.path import abspath, join
 from pathlib import Path
 from shutil import rmtree
 from unittest import TestCase
 
 from hypothesis import given
 from hypothesis.strategies import text
+from requests.exceptions import Timeout
 import responses
 
 from at import create_app
@@ -20,7 +21,7 @@ VALID_API_KEY = 'foobar'
 
 def get_path(filename):
     '''Returns file path'''
-    return ''.join([TEST_DATA_DIR, filename])
+    return join(TEST_DATA_DIR, filename)
 
 
 class TestUtilsAuthentication(TestCase):
@@ -64,6 +65,28 @@ class TestUtilsAuthentication(TestCase):
                 self.assertEqual(result.status_code, 401)
                 self.assertEqual(json_data['error'], 'API key is missing')
 
+    @responses.activate
+    def test_authentication_connection_error(self):
+        responses.add(
+                responses.POST,
+                DT_APPAUTH_URL,
+                body=Timeout('foobar'))
+
+        with self.app.test_client() as client:
+            with self.app.app_context():
+                filename = get_path(TEST_XML_DRAFT)
+                result = client.post(
+                            '/api/render/xml',
+                            data={
+                                'file': (open(filename, 'rb'), filename),
+                                'apikey': VALID_API_KEY})
+                json_data = result.get_json()
+
+                self.assertEqual(result.status_code, 400)
+                self.assertEqual(
+                        json_data['error'],
+                        'Can not connect to datatracker to validate API key')
+
     @responses.activate
     def test_authentication_valid_api_key(self):
         responses.add(
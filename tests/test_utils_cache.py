@@ -0,0 +1,185 @@
+from logging import disable as set_logger, INFO, CRITICAL
+from os.path import join
+from pathlib import Path
+from shutil import copy, rmtree
+from threading import Event, Thread
+from time import sleep
+from unittest import TestCase
+
+from at.utils.cache import (
+        get_cached, get_digest, get_pending, set_cached, SingleFlight)
+
+TEST_DATA_DIR = './tests/data/'
+TEST_XML_DRAFT = 'draft-smoke-signals-00.xml'
+TEST_TEXT_DRAFT = 'draft-smoke-signals-00.txt'
+TEMPORARY_DATA_DIR = './tests/tmp/'
+CACHE_DIR = './tests/tmp/cache/'
+TEST_RESULT = {'url': 'https://example.org/api/export/foo/bar.xml',
+               'logs': {'errors': [], 'warnings': []}}
+
+
+class TestUtilsCache(TestCase):
+    '''Tests for at.utils.cache'''
+
+    def setUp(self):
+        # susspress logging messages
+        set_logger(CRITICAL)
+        # create copies of test data in temporary data dirs
+        for dir in ('foo', 'bar'):
+            Path(TEMPORARY_DATA_DIR, dir).mkdir(parents=True, exist_ok=True)
+            copy(join(TEST_DATA_DIR, TEST_XML_DRAFT),
+                 join(TEMPORARY_DATA_DIR, dir, TEST_XML_DRAFT))
+
+    def tearDown(self):
+        # set logging to INFO
+        set_logger(INFO)
+        # remove temporary data dir
+        rmtree(TEMPORARY_DATA_DIR, ignore_errors=True)
+
+    def test_get_digest(self):
+        filename = join(TEST_DATA_DIR, TEST_XML_DRAFT)
+
+        digest = get_digest(filename, 'xml')
+
+        self.assertEqual(len(digest), 64)
+        self.assertEqual(digest, get_digest(filename, 'xml'))
+        self.assertNotEqual(digest, get_digest(filename, 'html'))
+        self.assertNotEqual(digest,
+                            get_digest(filename, 'xml', versions={'a': '1'}))
+        self.assertNotEqual(
+                get_digest(filename, 'xml', date='2024-01-01'),
+                get_digest(filename, 'xml', date='2024-01-02'))
+        self.assertNotEqual(
+                digest,
+                get_digest(join(TEST_DATA_DIR, TEST_TEXT_DRAFT), 'xml'))
+
+    def test_get_cached_miss(self):
+        self.assertIsNone(get_cached('foobar', CACHE_DIR, TEMPORARY_DATA_DIR))
+
+    def test_set_cached(self):
+        file = join('foo', TEST_XML_DRAFT)
+
+        set_cached('foobar', TEST_RESULT, CACHE_DIR, TEMPORARY_DATA_DIR,
+                   file=file)
+
+        self.assertEqual(
+                get_cached('foobar', CACHE_DIR, TEMPORARY_DATA_DIR),
+                TEST_RESULT)
+
+    def test_set_cached_without_file(self):
+        set_cached('foobar', TEST_RESULT, CACHE_DIR, TEMPORARY_DATA_DIR)
+
+        self.assertEqual(
+                get_cached('foobar', CACHE_DIR, TEMPORARY_DATA_DIR),
+                TEST_RESULT)
+
+    def test_get_cached_missing_file(self):
+        file = join('foo', TEST_XML_DRAFT)
+
+        set_cached('foobar', TEST_RESULT, CACHE_DIR, TEMPORARY_DATA_DIR,
+                   file=file)
+        rmtree(join(TEMPORARY_DATA_DIR, 'foo'))
+
+        self.assertIsNone(get_cached('foobar', CACHE_DIR, TEMPORARY_DATA_DIR))
+
+    def test_set_cached_eviction(self):
+        size = Path(TEST_DATA_DIR, TEST_XML_DRAFT).stat().st_size
+
+        set_cached('foo', TEST_RESULT, CACHE_DIR, TEMPORARY_DATA_DIR,
+                   file=join('foo', TEST_XML_DRAFT),
+                   max_bytes=size)
+        set_cached('bar', TEST_RESULT, CACHE_DIR, TEMPORARY_DATA_DIR,
+                   file=join('bar', TEST_XML_DRAFT),
+                   max_bytes=size)
+
+        self.assertIsNone(get_cached('foo', CACHE_DIR, TEMPORARY_DATA_DIR))
+        self.assertFalse(Path(TEMPORARY_DATA_DIR, 'foo').exists())
+        self.assertEqual(
+                get_cached('bar', CACHE_DIR, TEMPORARY_DATA_DIR),
+                TEST_RESULT)
+
+    def test_set_cached_max_entries(self):
+        for digest in ('foo', 'bar', 'foobar'):
+            set_cached(digest, TEST_RESULT, CACHE_DIR, TEMPORARY_DATA_DIR,
+                       max_entries=2)
+
+        self.assertIsNone(get_cached('foo', CACHE_DIR, TEMPORARY_DATA_DIR))
+        for digest in ('bar', 'foobar'):
+            self.assertEqual(
+                    get_cached(digest, CACHE_DIR, TEMPORARY_DATA_DIR),
+                    TEST_RESULT)
+
+    def test_single_flight(self):
+        single_flight = SingleFlight()
+        started = Event()
+        release = Event()
+        results = []
+
+        def leader():
+            started.set()
+            release.wait(timeout=5)
+            return 'foo'
+
+        def follower():
+            results.append(single_flight.do('foobar', lambda: 'bar'))
+
+        thread = Thread(target=lambda: results.append(
+                                        single_flight.do('foobar', leader)))
+        thread.start()
+        started.wait(timeout=5)
+        follower_thread = Thread(target=follower)
+        follower_thread.start()
+        # wait for the follower to join the running call
+        sleep(0.1)
+        release.set()
+        thread.join()
+        follower_thread.join()
+
+        self.assertCountEqual(results, [('foo', False), ('foo', True)])
+        self.assertEqual(single_flight.do('foobar', lambda: 'bar'),
+                         ('bar', False))
+
+    def test_single_flight_error(self):
+        single_flight = SingleFlight()
+
+        def error():
+            raise ValueError('foobar')
+
+        with self.assertRaises(ValueError):
+            single_flight.do('foobar', error)
+
+        self.assertEqual(single_flight.calls, {})
+
+    def test_single_flight_timeout(self):
+        single_flight = SingleFlight(timeout=0.1)
+        started = Event()
+        release = Event()
+
+        def leader():
+            started.set()
+            release.wait(timeout=5)
+            return 'foo'
+
+        thread = Thread(target=single_flight.do, args=('foobar', leader))
+        thread.start()
+        started.wait(timeout=5)
+
+        self.assertEqual(single_flight.do('foobar', lambda: 'bar'),
+                         ('bar', False))
+
+        release.set()
+        thread.join()
+
+    def test_get_pending(self):
+        self.assertEqual(get_pending('foobar', 'foo', CACHE_DIR), 'foo')
+        self.assertEqual(get_pending('foobar', 'bar', CACHE_DIR), 'foo')
+
+        # expired pending task
+        self.assertEqual(get_pending('foobar', 'bar', CACHE_DIR, timeout=-1),
+                         'bar')
+
+    def test_set_cached_pending(self):
+        get_pending('foobar', 'foo', CACHE_DIR)
+        set_cached('foobar', TEST_RESULT, CACHE_DIR, TEMPORARY_DATA_DIR)
+
+        self.assertEqual(get_pending('foobar', 'bar', CACHE_DIR), 'bar')
@@ -1,11 +1,14 @@
+from io import BytesIO
 from logging import disable as set_logger, INFO, CRITICAL
 from pathlib import Path
 from shutil import rmtree
 from unittest import TestCase
+from unittest.mock import patch
 
 from faker import Faker
 from hypothesis import given, assume
 from hypothesis.strategies import text
+import responses
 from werkzeug.datastructures import FileStorage
 
 from at.utils.file import (
@@ -96,6 +99,26 @@ class TestUtilsFile(TestCase):
                 self.assertTrue(Path(dir_path).exists())
                 self.assertTrue(Path(file_path).exists())
 
+    def test_save_file_content(self):
+        with open(''.join([TEST_DATA_DIR, TEST_XML_DRAFT]), 'rb') as file:
+            content = file.read()
+
+        with open(''.join([TEST_DATA_DIR, TEST_XML_DRAFT]), 'rb') as file:
+            for stream in (file, BytesIO(content)):
+                file_object = FileStorage(stream, filename=TEST_XML_DRAFT)
+                (_, file_path) = save_file(file_object, TEMPORARY_DATA_DIR)
+                self.assertEqual(Path(file_path).read_bytes(), content)
+
+    @patch('at.utils.file.sendfile', side_effect=OSError('foobar'))
+    def test_save_file_without_sendfile(self, _):
+        with open(''.join([TEST_DATA_DIR, TEST_XML_DRAFT]), 'rb') as file:
+            content = file.read()
+            file.seek(0)
+            file_object = FileStorage(file, filename=TEST_XML_DRAFT)
+            (_, file_path) = save_file(file_object, TEMPORARY_DATA_DIR)
+
+        self.assertEqual(Path(file_path).read_bytes(), content)
+
     @given(text())
     def test_save_file_from_text(self, text):
         dir_path,  file_path = save_file_from_text(text, TEMPORARY_DATA_DIR)
@@ -127,6 +150,21 @@ class TestUtilsFile(TestCase):
         self.assertEqual(str(error.exception),
                          'Can not determine the filename: {}'.format(url))
 
+    @responses.activate
+    def test_save_file_from_url_content(self):
+        url = 'https://example.org/draft-smoke-signals-00.txt'
+        content = 'Smoke signals ☁\n'.encode('utf-8')
+        responses.add(
+                responses.GET,
+                url,
+                body=content,
+                content_type='text/plain',
+                status=200)
+
+        (_, file_path) = save_file_from_url(url, TEMPORARY_DATA_DIR)
+
+        self.assertEqual(Path(file_path).read_bytes(), content)
+
     def test_save_file_from_url_valid(self):
         id_url = 'https://www.ietf.org/archive/id/draft-ietf-quic-http-23.txt'
         (dir_path, file_path) = save_file_from_url(id_url, TEMPORARY_DATA_DIR)
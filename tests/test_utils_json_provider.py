@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+from flask import jsonify
+
+from at import create_app
+from at.utils.json_provider import ORJSONProvider
+
+
+class TestUtilsJsonProvider(TestCase):
+    '''Tests for at.utils.json_provider'''
+
+    def setUp(self):
+        self.app = create_app({'REQUIRE_AUTH': False})
+
+    def test_json_provider(self):
+        self.assertIsInstance(self.app.json, ORJSONProvider)
+
+    def test_dumps(self):
+        self.assertEqual(self.app.json.dumps({'b': 1, 'a': ['é', None]}),
+                         '{"a":["é",null],"b":1}')
+
+    def test_loads(self):
+        self.assertEqual(self.app.json.loads('{"a": ["é", null]}'),
+                         {'a': ['é', None]})
+        self.assertEqual(self.app.json.loads(b'{"a": 1}'), {'a': 1})
+
+    def test_jsonify(self):
+        with self.app.app_context():
+            response = jsonify(error='foobar')
+
+            self.assertEqual(response.mimetype, 'application/json')
+            self.assertEqual(response.get_json(), {'error': 'foobar'})
@@ -1,11 +1,12 @@
 from logging import disable as set_logger, INFO, CRITICAL
 from unittest import TestCase
 
+from requests.exceptions import ConnectionError, Timeout
 import responses
 
 from at.utils.net import (
         get_both, get_latest, get_previous, is_valid_url, is_url, InvalidURL,
-        DocumentNotFound)
+        DocumentNotFound, TTLCache, get_session, latest_cache, POOL_SIZE)
 
 DT_LATEST_DRAFT_URL = 'https://datatracker.ietf.org/api/rfcdiff-latest-json'
 
@@ -20,6 +21,8 @@ class TestUtilsNet(TestCase):
     def tearDown(self):
         # set logging to INFO
         set_logger(INFO)
+        # clear latest document cache
+        latest_cache.clear()
 
     def test_get_latest_not_found_error(self):
         with self.assertRaises(DocumentNotFound) as error:
@@ -28,6 +31,24 @@ class TestUtilsNet(TestCase):
         self.assertEqual(str(error.exception),
                          'Can not find the latest document on datatracker')
 
+    @responses.activate
+    def test_datatracker_connection_error(self):
+        draft = 'draft-ietf-quic-http'
+        for exception in (ConnectionError('foobar'), Timeout('foobar')):
+            responses.add(
+                    responses.GET,
+                    '/'.join([DT_LATEST_DRAFT_URL, draft]),
+                    body=exception)
+
+            for function in (get_latest, get_previous, get_both):
+                with self.assertRaises(DocumentNotFound) as error:
+                    function(draft, DT_LATEST_DRAFT_URL)
+
+                self.assertEqual(str(error.exception),
+                                 'Can not connect to datatracker')
+
+            responses.reset()
+
     @responses.activate
     def test_get_latest_no_content_url_error(self):
         rfc = 'rfc666'
@@ -53,6 +74,53 @@ class TestUtilsNet(TestCase):
         latest_draft_url = get_latest(draft, DT_LATEST_DRAFT_URL)
         self.assertTrue(latest_draft_url.startswith('https://'))
 
+    @responses.activate
+    def test_get_latest_cache(self):
+        draft = 'draft-ietf-quic-http'
+        urls = ['https://www.ietf.org/archive/id/{}-{}.txt'.format(draft, rev)
+                for rev in ('33', '34')]
+        for url in urls:
+            responses.add(
+                    responses.GET,
+                    '/'.join([DT_LATEST_DRAFT_URL, draft]),
+                    json={'content_url': url},
+                    status=200)
+
+        # responses are used in order
+        self.assertEqual(get_latest(draft, DT_LATEST_DRAFT_URL, cache_ttl=60),
+                         urls[0])
+        self.assertEqual(get_latest(draft, DT_LATEST_DRAFT_URL, cache_ttl=60),
+                         urls[0])
+        self.assertEqual(get_latest(draft, DT_LATEST_DRAFT_URL), urls[1])
+
+    @responses.activate
+    def test_get_session(self):
+        url = 'https://example.org/'
+        responses.add(
+                responses.GET,
+                url,
+                headers={'Set-Cookie': 'foo=bar; Domain=example.org'},
+                status=200)
+        session = get_session()
+
+        self.assertEqual(session.get_adapter(url)._pool_maxsize, POOL_SIZE)
+        session.get(url)
+        self.assertEqual(len(session.cookies), 0)
+
+    def test_ttl_cache(self):
+        cache = TTLCache(maxsize=2)
+
+        cache.set('foo', 'bar', ttl=60)
+        cache.set('expired', 'bar', ttl=-1)
+        self.assertEqual(cache.get('foo'), 'bar')
+        self.assertIsNone(cache.get('expired'))
+        self.assertIsNone(cache.get('foobar'))
+
+        cache.set('bar', 'baz', ttl=60)
+        cache.set('baz', 'foo', ttl=60)
+        self.assertIsNone(cache.get('foo'))
+        self.assertEqual(cache.get('baz'), 'foo')
+
     def test_invalid_urls(self):
         allowed_domains = ['example.com', ]
         urls = [
@@ -0,0 +1,63 @@
+from logging import disable as set_logger, INFO, CRITICAL
+from os.path import join
+from pathlib import Path
+from shutil import copy, rmtree
+from unittest import TestCase
+
+from at.utils.runner import run_xml2rfc, set_in_process
+
+TEST_DATA_DIR = './tests/data/'
+TEST_XML_DRAFT = 'draft-smoke-signals-00.xml'
+TEST_XML_ERROR = 'draft-smoke-signals-00.error.xml'
+TEST_DATA = [TEST_XML_DRAFT, TEST_XML_ERROR]
+TEMPORARY_DATA_DIR = './tests/tmp/'
+
+
+class TestUtilsRunner(TestCase):
+    '''Tests for at.utils.runner'''
+
+    def setUp(self):
+        # susspress logging messages
+        set_logger(CRITICAL)
+        # create temporary data dir
+        Path(TEMPORARY_DATA_DIR).mkdir(exist_ok=True)
+        # create copies of test data in temporary data dir
+        for file in TEST_DATA:
+            original = join(TEST_DATA_DIR, file)
+            new = join(TEMPORARY_DATA_DIR, file)
+            copy(original, new)
+
+    def tearDown(self):
+        # set logging to INFO
+        set_logger(INFO)
+        # remove temporary data dir
+        rmtree(TEMPORARY_DATA_DIR, ignore_errors=True)
+        # reset xml2rfc runner
+        set_in_process(False)
+
+    def test_run_xml2rfc(self):
+        for in_process in (False, True):
+            set_in_process(in_process)
+            text_file = join(TEMPORARY_DATA_DIR, 'output.txt')
+
+            output = run_xml2rfc(
+                    args=['xml2rfc', '--text', '--out', text_file,
+                          join(TEMPORARY_DATA_DIR, TEST_XML_DRAFT)])
+
+            self.assertEqual(output.returncode, 0)
+            self.assertTrue(Path(text_file).exists())
+            self.assertIn(b'Created file', output.stderr)
+
+            Path(text_file).unlink()
+
+    def test_run_xml2rfc_error(self):
+        for in_process in (False, True):
+            set_in_process(in_process)
+
+            output = run_xml2rfc(
+                    args=['xml2rfc', '--text', '--out',
+                          join(TEMPORARY_DATA_DIR, 'output.txt'),
+                          join(TEMPORARY_DATA_DIR, TEST_XML_ERROR)])
+
+            self.assertNotEqual(output.returncode, 0)
+            self.assertIn(b'Error', output.stderr)